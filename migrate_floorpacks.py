@@ -0,0 +1,64 @@
+'''This script converts floorpack files to the current version of the floorpack format
+(see src/floorpack_format.py). It can be executed with python:
+
+    python migrate_floorpacks.py                    (every floorpack in resources/floors)
+    python migrate_floorpacks.py path/to/pack.yaml  (only the given floorpacks)
+
+Files that are already up to date are left alone.
+With --binary, each floorpack is replaced by a binary floorpack with the same name instead
+(see src/binary_floorpack.py), which is much quicker to load for packs with very many floors.
+Exits with code 1 if any file isn't a floorpack.'''
+import sys
+from pathlib import Path
+from src.file_utility import FileUtility
+from src.floorpack_format import FloorpackFormat
+from src.binary_floorpack import BinaryFloorpack
+from src.floorpack_journal import FloorpackJournal
+
+def migrate(path: Path) -> bool:
+    '''Rewrite the floorpack at the given path in the current version, if it isn't already.
+    Return whether it was changed. If the file isn't a floorpack, raise TypeError.'''
+    with open(path.as_posix()) as file:
+        text = file.read()
+    floorpack = FloorpackFormat.load(text)
+    new_text = FloorpackFormat.dump(floorpack)
+    if new_text == text: return False
+    with open(path.as_posix(), 'w') as file:
+        file.write(new_text)
+    return True
+
+def convert_to_binary(path: Path) -> Path:
+    '''Replace the YAML floorpack at the given path with a binary floorpack of the same name,
+    including any changes in its journal (see src/floorpack_journal.py), and return its path.
+    Only one file can have a floorpack's name, so the YAML file is deleted once the binary one is written.
+    If the file isn't a floorpack, raise TypeError.'''
+    with open(path.as_posix()) as file:
+        floorpack = FloorpackFormat.load(file)
+    floorpack = FloorpackJournal.replay(path.resolve(), floorpack)
+    binary_path = path.with_suffix(BinaryFloorpack.EXTENSION)
+    BinaryFloorpack.save(floorpack, binary_path)
+    path.unlink()
+    return binary_path
+
+def main():
+    args = sys.argv[1:]
+    binary = '--binary' in args
+    paths = [Path(arg) for arg in args if arg != '--binary']
+    if not paths:
+        floorpack_dir = FileUtility.path_to_resource_directory('floors')
+        paths = sorted(path for path in floorpack_dir.iterdir()
+                       if path.is_file() and path.suffix != BinaryFloorpack.EXTENSION)
+
+    all_valid = True
+    for path in paths:
+        try:
+            if binary: print (f'{path.name}: replaced by {convert_to_binary(path).name}')
+            elif migrate(path): print (f'{path.name}: migrated')
+            else: print (f'{path.name}: already up to date')
+        except (OSError, TypeError):
+            print (f'{path.name}: not a valid floorpack')
+            all_valid = False
+    return all_valid
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)
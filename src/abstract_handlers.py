@@ -212,31 +212,79 @@ class ArbitraryOptionsControlWithBackButton(ArbitraryOptionsControl, ABC):
 class VisualHandler:
     '''Has access to the window surface to draw graphics onto,
     and implements a draw() method.
-    Visual handlers inherit from it.'''
+    Visual handlers inherit from it.
+
+    To save redrawing frames where nothing has changed, only the parts of the window
+    reported with mark_damaged() are drawn again, clipped to those parts,
+    as long as every visual handler in the state has _TRACKS_DAMAGE set.
+    Otherwise the whole window is drawn every frame.'''
+
+    # Also used by FloorVisual for its cached surfaces.
+    _BG_COL = pg.Color(10,10,10)
+    # Set by children that report every change they make to the window with mark_damaged().
+    _TRACKS_DAMAGE = False
+    # Rects of the window that have changed since the last frame was drawn,
+    # or None if the whole window needs drawing.
+    __damage = None
 
-    __BG_COL = pg.Color(10,10,10)
     @classmethod
     def set_window(cls, window_surf):
         '''Set the surface used to draw graphics on'''
         cls._window = window_surf
         cls._window_dimensions = window_surf.get_size()
 
+    @classmethod
+    def prepare_frame(cls):
+        '''Called every frame before drawing, whether or not anything will be drawn.
+        Children that track damage can check for changes here, e.g. animations,
+        and report them with mark_damaged().'''
+        ...
+
     @classmethod
     @abstractmethod
     def draw(cls):
-        '''Called every frame to draw graphics.
+        '''Called to draw graphics, every frame where part of the window needs drawing.
         Implemented by children'''
         ...
 
+    @staticmethod
+    def mark_damaged(rect=None):
+        '''Note that the given rect of the window has changed and needs drawing again,
+        or the whole window if no rect is given.'''
+        if rect is None: VisualHandler.__damage = None
+        elif VisualHandler.__damage is not None: VisualHandler.__damage.append(pg.Rect(rect))
+
     @classmethod
     def get_graphics(cls):
         '''Get the graphics surface so it can be blitted onto the game window'''
         return cls._window
     
     @classmethod
-    def start_draw(cls):
-        '''Fill the surface with a background to prepare for drawing'''
-        cls._window.fill(cls.__BG_COL)
+    def start_draw(cls, handlers) -> list:
+        '''Prepare the surface for the given visual handlers to draw on,
+        filling the parts that need drawing with a background.
+        Return the rects that need drawing and showing on the window:
+        an empty list if nothing has changed.
+        The surface is clipped to the area being drawn, until end_draw() is called.'''
+        damage = VisualHandler.__damage
+        VisualHandler.__damage = []
+        window_rect = cls._window.get_rect()
+
+        if damage is None or not all(handler._TRACKS_DAMAGE for handler in handlers):
+            cls._window.fill(cls._BG_COL)
+            return [window_rect]
+
+        damage = [rect.clip(window_rect) for rect in damage]
+        damage = [rect for rect in damage if rect.width and rect.height]
+        if not damage: return []
+        cls._window.set_clip(damage[0].unionall(damage[1:]))
+        cls._window.fill(cls._BG_COL)
+        return damage
+
+    @classmethod
+    def end_draw(cls):
+        '''Stop clipping the surface after drawing.'''
+        cls._window.set_clip(None)
 
     @staticmethod
     def _centred_in_dimensions(x_dimens: int, y_dimens: int, elem_w: int, elem_h: int):
@@ -245,6 +293,8 @@ class VisualHandler:
         return (x_dimens - elem_w) // 2, (y_dimens - elem_h) // 2
     
 class TextDisplayVisualHandler(VisualHandler, ABC):
+    # The text only changes in init(), when entering a state, when everything is drawn anyway.
+    _TRACKS_DAMAGE = True
     __FONT = FontManager.get_heading_font()
     __COL = pg.Color(255,255,255)
     _text = 'This message should not appear'
@@ -18,6 +18,9 @@ class App(ABC):
 
     _TITLE = 'Painter'
 
+    # Events after which the whole window is drawn again.
+    __REDRAW_EVENTS = (pg.WINDOWEXPOSED, pg.WINDOWRESTORED, pg.WINDOWSHOWN, pg.WINDOWSIZECHANGED)
+
     def __init__(self, initial_state_name: str, window):
         '''Store window, enter initial state.'''
         self._change_state(initial_state_name)
@@ -64,17 +67,25 @@ class App(ABC):
                 if not isinstance(new_state, str): return new_state
                 self._change_state(new_state)
 
+            # The window's contents may have been lost.
+            if e.type in self.__REDRAW_EVENTS: VisualHandler.mark_damaged()
+
             self._other_event_processing(e)
         
-        # Draw graphics
-        VisualHandler.start_draw()
+        # Draw graphics, only where they have changed.
         handlers = self._state.get_visual_handlers()
         for visual_handler in handlers:
-            visual_handler.draw()
+            visual_handler.prepare_frame()
+        damage = VisualHandler.start_draw(handlers)
+        if damage:
+            for visual_handler in handlers:
+                visual_handler.draw()
+            VisualHandler.end_draw()
 
-        graphics_surf = VisualHandler.get_graphics()
-        self.__window.blit(graphics_surf,(0,0))
-        pg.display.update()
+            graphics_surf = VisualHandler.get_graphics()
+            area = damage[0].unionall(damage[1:])
+            self.__window.blit(graphics_surf, area, area)
+            pg.display.update(damage)
 
         # Limit frame rate
         delta_time = self.__class__.__clock.tick(30) / 1000
@@ -94,6 +105,8 @@ class App(ABC):
             # Call the enter() method, which can *also* cause a change of state:
             # for temporary states that do processing before moving on
             state_name = self._state.enter()
+        # Different visual handlers, so draw everything.
+        VisualHandler.mark_damaged()
 
     def _other_event_processing(self, event):
         '''Additional processing to respond to any event other than closing the game.
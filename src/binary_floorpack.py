@@ -0,0 +1,91 @@
+import struct
+from collections.abc import Sequence
+from .editor.floor_data import FloorData
+try:
+    import mmap
+except ImportError:
+    # Not available in the web version.
+    mmap = None
+
+class BinaryFloorpack(Sequence):
+    '''A floorpack in a compact binary file, for packs with very many floors.
+    Floors are only read and turned into FloorData when they're accessed by index,
+    so loading is quick and neither it nor memory use grows with the number of floors.
+    Otherwise it can be used like a list of FloorData, but can't be changed.
+
+    The file is a header followed by one fixed-size record for each floor,
+    so the record for any floor can be found straight away.
+    Header: magic bytes, format version, record size, number of floors.
+    Record: width, height, starting x, starting y,
+    and a bitmask of cells that start filled, with the cell at x,y at bit y * width + x.
+    All little-endian.'''
+
+    EXTENSION = '.pack'
+
+    __MAGIC = b'PFLR'
+    __VERSION = 1
+    __HEADER = struct.Struct('<4sHHI')
+    __RECORD = struct.Struct('<BBBBQ')
+
+    def __init__(self, path):
+        '''Open the binary floorpack at the given pathlib.Path.
+        The file is memory-mapped where possible, rather than read.
+        If the file isn't a valid binary floorpack, raise TypeError.
+        Only the header is checked here: each floor is checked when it's read.'''
+        with open(path.as_posix(), 'rb') as file:
+            try: self.__data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (AttributeError, OSError, ValueError):
+                # No mmap, or the file is empty.
+                self.__data = file.read()
+
+        try:
+            magic, version, record_size, num_floors = self.__HEADER.unpack_from(self.__data)
+        except struct.error:
+            raise TypeError
+        if magic != self.__MAGIC or version != self.__VERSION or record_size != self.__RECORD.size:
+            raise TypeError
+        if len(self.__data) != self.__HEADER.size + num_floors * record_size:
+            raise TypeError
+        self.__len = num_floors
+
+    def __len__(self):
+        return self.__len
+
+    def __getitem__(self, index):
+        '''Return a new FloorData for the floor at the given index.
+        If its record doesn't describe a valid floor, raise TypeError.'''
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.__len))]
+        if index < 0: index += self.__len
+        if not 0 <= index < self.__len: raise IndexError
+        offset = self.__HEADER.size + index * self.__RECORD.size
+        width, height, start_x, start_y, full = self.__RECORD.unpack_from(self.__data, offset)
+        if not FloorData.is_valid_size(width, height) or start_x >= width or start_y >= height \
+                or full >> (width * height) or full >> (start_y * width + start_x) & 1:
+            raise TypeError
+
+        floor = FloorData(width, height)
+        grid = floor.get_cell_grid()
+        while full:
+            bit = full & -full
+            full ^= bit
+            cell = bit.bit_length() - 1
+            grid[(cell % width, cell // width)].start_filled()
+        floor.set_initial_painter_position((start_x, start_y))
+        return floor
+
+    def close(self):
+        '''Unmap the file, e.g. before overwriting it. The pack can't be used afterwards.'''
+        if mmap is not None and isinstance(self.__data, mmap.mmap): self.__data.close()
+
+    @classmethod
+    def save(cls, floorpack, path):
+        '''Write the floorpack (any sequence of FloorData) to a binary file at the given pathlib.Path.'''
+        records = [cls.__HEADER.pack(cls.__MAGIC, cls.__VERSION, cls.__RECORD.size, len(floorpack))]
+        for floor in floorpack:
+            grid = floor.get_cell_grid()
+            width, height = grid.get_size()
+            start_x, start_y = floor.get_initial_painter_position()
+            records.append(cls.__RECORD.pack(width, height, start_x, start_y, grid.get_full_mask()))
+        with open(path.as_posix(), 'wb') as file:
+            file.write(b''.join(records))
@@ -0,0 +1,60 @@
+import hashlib
+import os
+from .file_utility import FileUtility
+from .binary_floorpack import BinaryFloorpack
+
+class CompiledPackCache:
+    '''Keeps a BinaryFloorpack copy of each YAML floorpack that's been read,
+    in resources/cache/packs, so the YAML doesn't need parsing again next time.
+
+    Copies are named after a hash of the YAML file's contents,
+    so a changed file (or a different file with the same contents) is never mixed up
+    with an old copy, wherever it is and whatever its modification time.
+    The least recently used copies are deleted when there are too many.'''
+
+    __DIRNAME = 'packs'
+    __MAX_FILES = 256
+
+    @classmethod
+    def load(cls, content: bytes) -> BinaryFloorpack | None:
+        '''Return the compiled copy of the floorpack file with the given contents,
+        or None if there isn't one.'''
+        path = cls.__path_for(content)
+        if not path.exists(): return None
+        try: floorpack = BinaryFloorpack(path)
+        except (OSError, TypeError): return None
+        # Mark as recently used.
+        try: os.utime(path.as_posix())
+        except OSError: pass
+        return floorpack
+
+    @classmethod
+    def store(cls, content: bytes, floorpack: list):
+        '''Save a compiled copy of the floorpack read from a file with the given contents.'''
+        path = cls.__path_for(content)
+        temp_path = path.with_suffix('.tmp')
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first, so a copy is never seen half-written.
+            BinaryFloorpack.save(floorpack, temp_path)
+            os.replace(temp_path.as_posix(), path.as_posix())
+        except OSError as e:
+            print ('Unable to save compiled floorpack:', e)
+            return
+        cls.__prune(path.parent)
+
+    @classmethod
+    def __path_for(cls, content: bytes):
+        digest = hashlib.sha256(content).hexdigest()
+        return FileUtility.path_to_resource_directory('cache') / cls.__DIRNAME / (digest + BinaryFloorpack.EXTENSION)
+
+    @classmethod
+    def __prune(cls, directory):
+        '''Delete the least recently used copies if there are more than __MAX_FILES.'''
+        paths = list(directory.glob('*' + BinaryFloorpack.EXTENSION))
+        if len(paths) <= cls.__MAX_FILES: return
+        try: paths.sort(key=lambda path: path.stat().st_mtime_ns)
+        except OSError: return
+        for path in paths[:len(paths) - cls.__MAX_FILES]:
+            try: path.unlink()
+            except OSError: pass
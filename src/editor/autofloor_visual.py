@@ -3,12 +3,16 @@ from ..abstract_handlers import VisualHandler
 from ..font_utility import FontManager
 from ..audio_utility import SFXPlayer
 from .floor_auto_player import FloorAutoPlayer
+from .solver_worker import SolverWorker
 class AutoFloorVisual(VisualHandler):
     __YES_COL = pg.Color(0,200,0)
     __NO_COL = pg.Color(200,0,0)
     __TEXT_COL = pg.Color(0,0,0)
     __BROKEN_COL = pg.Color(200,200,200)
+    __COMPUTING_COL = pg.Color(230,190,0)
     __RADIUS = 30
+    # Width of the ring drawn round the heuristic's result while the solver is computing.
+    __COMPUTING_RING_WIDTH = 6
     __TOGGLE_RECT = pg.Rect(0,0,__RADIUS * 2,__RADIUS * 2)
     __TEXT_MARGIN = __RADIUS // 2
     __num_solutions = 0
@@ -22,21 +26,47 @@ class AutoFloorVisual(VisualHandler):
     # 3 : checking number of solutions
     __state = 1
 
+    # Generation number of the job given to SolverWorker for states 2 and 3,
+    # or None if there's no result being waited on.
+    __waiting_for = None
+
     @classmethod
     def update(cls, floor_obj):
-        if cls.__state == 3:
-            try:
-                cls.__num_solutions = FloorAutoPlayer.num_solutions(floor_obj)
-            except ValueError:
-                cls.__state = 1
-            else: cls.__is_possible = cls.__num_solutions > 0
-        elif cls.__state == 2:
-            try:
-                cls.__is_possible = FloorAutoPlayer.is_possible(floor_obj)
-            except ValueError:
-                cls.__state = 1
-        if cls.__state == 1:
-            cls.__is_possible = FloorAutoPlayer.is_possible_heuristic(floor_obj)
+        '''Update the indicator for a change to the floor.
+        The heuristic is quick enough to check straight away, in every state,
+        and its result is shown until a better one arrives.
+        States 2 and 3 are sent to SolverWorker, unless the heuristic has already settled them
+        (a floor it rules out has no solutions to count): the indicator shows that
+        it's computing until poll() picks up the result.'''
+        cls.__is_possible = FloorAutoPlayer.is_possible_heuristic(floor_obj)
+        if cls.__state == 3 and cls.__is_possible is not False: kind = 'count'
+        elif cls.__state == 2 and cls.__is_possible is None: kind = 'possible'
+        else:
+            SolverWorker.cancel()
+            cls.__waiting_for = None
+            cls.__num_solutions = 0
+            return
+        cls.__waiting_for = SolverWorker.submit(kind, floor_obj)
+
+    @classmethod
+    def poll(cls):
+        '''Pick up the result from SolverWorker if it has arrived.
+        Called every frame.'''
+        if cls.__waiting_for is None: return
+        output = SolverWorker.poll()
+        if output is None: return
+        generation, result = output
+        # Ignore results for older versions of the floor.
+        if generation != cls.__waiting_for: return
+        cls.__waiting_for = None
+
+        if result is None:
+            # The solver gave up: keep showing the heuristic's result.
+            cls.__state = 1
+        elif cls.__state == 3:
+            cls.__num_solutions = result
+            cls.__is_possible = result > 0
+        else: cls.__is_possible = result
 
     @classmethod
     def toggle_solution_count(cls, floor_obj):
@@ -51,10 +81,16 @@ class AutoFloorVisual(VisualHandler):
 
     @classmethod
     def draw(cls):
+        centre = (cls.__RADIUS, cls.__RADIUS)
+        computing = cls.__waiting_for is not None
         if cls.__is_possible is not None:
             col = cls.__is_possible and cls.__YES_COL or cls.__NO_COL
-            pg.draw.circle(cls._window, col, (cls.__RADIUS, cls.__RADIUS), cls.__RADIUS)
-            if cls.__state == 3:
-                text = cls.__FONT.render(str(cls.__num_solutions), False, cls.__TEXT_COL)
+            pg.draw.circle(cls._window, col, centre, cls.__RADIUS)
+            # The heuristic's result is shown while computing, but it can't count solutions.
+            if computing:
+                pg.draw.circle(cls._window, cls.__COMPUTING_COL, centre, cls.__RADIUS, cls.__COMPUTING_RING_WIDTH)
+            elif cls.__state == 3:
+                text = FontManager.render(cls.__FONT, str(cls.__num_solutions), cls.__TEXT_COL, antialias=False)
                 cls._window.blit(text, (cls.__TEXT_MARGIN, cls.__TEXT_MARGIN))
-        else: pg.draw.circle(cls._window, cls.__BROKEN_COL, (cls.__RADIUS, cls.__RADIUS), cls.__RADIUS)
\ No newline at end of file
+        elif computing: pg.draw.circle(cls._window, cls.__COMPUTING_COL, centre, cls.__RADIUS)
+        else: pg.draw.circle(cls._window, cls.__BROKEN_COL, centre, cls.__RADIUS)
@@ -0,0 +1,85 @@
+import time
+from .editor_floor_manager import EditorFloorManager
+from .gui_visual import EditorButtonsVisual
+
+class Autosaver:
+    '''Saves the floor being edited in the background, a little while after it's changed,
+    so nothing is lost if the save button isn't pressed and saving doesn't hold up a frame.
+
+    Changes are coalesced: while the floor keeps changing, or while a save is still being written,
+    nothing new is saved; afterwards, one save covers every change since the last.
+    Each save is written by EditorFloorManager's writer thread: all that's done here
+    is storing the floor and copying the list of floors, at most once every __MIN_INTERVAL seconds.
+    The status is shown on the save button by EditorButtonsVisual.'''
+
+    # Seconds after the last change before saving.
+    __DELAY = 1.5
+    # Seconds between the start of one save and the next.
+    __MIN_INTERVAL = 3
+
+    # The floor being edited, if it's changed since it was last saved.
+    __floor = None
+    __last_change_time = 0
+    __last_save_time = None
+    # Future for the save being written.
+    __future = None
+
+    @classmethod
+    def floor_changed(cls, floor_obj):
+        '''Note that the floor being edited has changed, so it will be saved later.'''
+        cls.__floor = floor_obj
+        cls.__last_change_time = time.monotonic()
+        if cls.__future is None: EditorButtonsVisual.set_save_status('unsaved')
+
+    @classmethod
+    def save_now(cls, floor_obj):
+        '''Start saving the floor being edited straight away. Called when the save button is pressed.'''
+        cls.__floor = floor_obj
+        cls.__start_save()
+
+    @classmethod
+    def leave_floor(cls):
+        '''Start saving the floor being edited straight away if it's changed,
+        before another state uses EditorFloorManager (e.g. to select a different floor).'''
+        if cls.__floor is not None: cls.__start_save()
+
+    @classmethod
+    def poll(cls):
+        '''Pick up the result of the save being written, if it's finished,
+        and start a new save if it's time to. Called every frame.'''
+        if cls.__future is not None:
+            if not cls.__future.done(): return
+            future = cls.__future
+            cls.__future = None
+            try:
+                future.result()
+                status = 'saved'
+            except Exception as e:
+                print ('Unable to save floorpack:', e)
+                status = 'failed'
+            EditorButtonsVisual.set_save_status(cls.__floor is None and status or 'unsaved')
+
+        if cls.__floor is None: return
+        now = time.monotonic()
+        if now - cls.__last_change_time < cls.__DELAY: return
+        if cls.__last_save_time is not None and now - cls.__last_save_time < cls.__MIN_INTERVAL: return
+        cls.__start_save()
+
+    @classmethod
+    def flush(cls):
+        '''Save any changes not saved yet, and wait until every save has been written,
+        with the whole floorpack written to its file. Called when leaving the editor.'''
+        cls.leave_floor()
+        EditorFloorManager.close_floorpack()
+        EditorFloorManager.wait_for_saves()
+        cls.poll()
+
+    @classmethod
+    def __start_save(cls):
+        '''Store the floor being edited, and start saving the floorpack in the background.
+        Saves are written in order, so there's no need to wait for the last one to finish.'''
+        EditorFloorManager.edit_floor(cls.__floor)
+        cls.__future = EditorFloorManager.save_floorpack_in_background()
+        cls.__floor = None
+        cls.__last_save_time = time.monotonic()
+        EditorButtonsVisual.set_save_status('saving')
@@ -0,0 +1,158 @@
+import time
+from ..direction_utility import DirectionUtility
+from .floor_pruner import FloorPruner
+
+class BitboardSolver:
+    '''Solver backend used by FloorAutoPlayer.
+    The grid is represented as an integer bitmask, where bit (y * width + x)
+    stands for the cell at x, y. The cells adjacent to each cell, accounting for
+    wrapping round the edges, are precomputed as bitmasks once per grid size.'''
+
+    __DIRECTIONS = [1,-1,2,-2]
+    # Number of positions visited between calls to should_stop() in __search().
+    __NODES_PER_STOP_CHECK = 2048
+
+    # Maps (width, height) to a tuple of neighbour masks, one per cell index.
+    __neighbour_masks = {}
+
+    @classmethod
+    def neighbour_masks(cls, width: int, height: int) -> tuple[int]:
+        '''Return a tuple containing, for each cell index, a bitmask of the cells
+        one move away from it. The masks are calculated on the first call for a size.
+        A cell is never counted as its own neighbour, which can otherwise happen
+        when wrapping round a grid that is 1 cell wide or high.'''
+        size = (width, height)
+        if size not in cls.__neighbour_masks:
+            masks = []
+            for y in range(height):
+                for x in range(width):
+                    mask = 0
+                    for direc in cls.__DIRECTIONS:
+                        adj_x, adj_y = DirectionUtility.pos_after_move(x, y, width, height, direc)
+                        mask |= 1 << (adj_y * width + adj_x)
+                    # Remove the cell itself.
+                    mask &= ~(1 << (y * width + x))
+                    masks.append(mask)
+            cls.__neighbour_masks[size] = tuple(masks)
+        return cls.__neighbour_masks[size]
+
+    @staticmethod
+    def encode(floor_obj) -> tuple[int]:
+        '''Return the width, height, bitmask of empty cells,
+        and index of the painter's starting cell for the given floor.
+        The starting cell is included in the empty cells.'''
+        grid = floor_obj.get_cell_grid()
+        width, height = grid.get_size()
+        empty = ((1 << (width * height)) - 1) & ~grid.get_full_mask()
+        start_x, start_y = floor_obj.get_initial_painter_position()
+        start = start_y * width + start_x
+        return width, height, empty | (1 << start), start
+
+    @classmethod
+    def is_possible(cls, floor_obj, node_limit: int) -> bool:
+        '''Return whether it is possible to clear the floor, using depth-first search.
+        If more than node_limit positions are visited, raise ValueError.'''
+        return cls.find_solution(floor_obj, node_limit) is not None
+
+    @classmethod
+    def find_solution(cls, floor_obj, node_limit: int, should_stop=None) -> list[int] | None:
+        '''Return a list of directions the painter can move in to clear the floor,
+        or None if it's impossible, using depth-first search.
+        If more than node_limit positions are visited, raise ValueError.
+        should_stop(), if given, is called every so often, and ValueError is raised if it returns True.'''
+        width, height, empty, start = cls.encode(floor_obj)
+        path = cls.__search(width, height, start, empty & ~(1 << start), node_limit, should_stop)
+        if path is None: return None
+        return cls.__directions_along(width, height, [start] + path)
+
+    @classmethod
+    def iter_solutions(cls, floor_obj, deadline: float=None):
+        '''Yield every solution for the floor, as lists of directions, one at a time.
+        Each way of visiting the cells is only yielded once, even when two directions
+        lead to the same cell. If deadline is given, stop when time.perf_counter()
+        passes it, even if there are solutions left.'''
+        width, height, empty, start = cls.encode(floor_obj)
+        remaining = empty & ~(1 << start)
+        neighbours = cls.neighbour_masks(width, height)
+        if not FloorPruner.parity_allows(width, height, start, remaining): return
+        if not FloorPruner.can_finish(width, height, start, remaining): return
+        path = [start]
+
+        def visit(pos: int, remaining: int, check_connected: bool):
+            if deadline is not None and time.perf_counter() > deadline: raise TimeoutError
+            if remaining == 0:
+                yield cls.__directions_along(width, height, path)
+                return
+            if not FloorPruner.can_finish(width, height, pos, remaining, check_connected): return
+
+            moves = neighbours[pos] & remaining
+            while moves:
+                bit = moves & -moves
+                moves ^= bit
+                index = bit.bit_length() - 1
+                after = remaining & ~bit
+                path.append(index)
+                yield from visit(index, after, (neighbours[index] & after).bit_count() > 1)
+                path.pop()
+
+        try: yield from visit(start, remaining, False)
+        except TimeoutError: return
+
+    @classmethod
+    def __directions_along(cls, width: int, height: int, path: list[int]) -> list[int]:
+        '''Given a list of cell indexes, each one move from the last,
+        return the directions to move in to follow it.'''
+        directions = []
+        for index, next_index in zip(path, path[1:]):
+            x, y = index % width, index // width
+            for direc in cls.__DIRECTIONS:
+                adj_x, adj_y = DirectionUtility.pos_after_move(x, y, width, height, direc)
+                if adj_y * width + adj_x == next_index:
+                    directions.append(direc)
+                    break
+        return directions
+
+    @classmethod
+    def __search(cls, width: int, height: int, start: int, remaining: int,
+                 node_limit: int, should_stop=None) -> list[int] | None:
+        '''Depth-first search from the start index over the remaining cells.
+        Return the indexes of the cells moved into, in order, if a solution was found,
+        and None otherwise.
+        Moves to cells with the fewest onward moves are tried first (Warnsdorff's rule),
+        and positions FloorPruner rules out are not searched any further.'''
+        neighbours = cls.neighbour_masks(width, height)
+        if not FloorPruner.parity_allows(width, height, start, remaining): return None
+        if not FloorPruner.can_finish(width, height, start, remaining): return None
+        if FloorPruner.has_splitting_cell(neighbours, remaining | (1 << start)): return None
+        nodes = 0
+        NODES_PER_STOP_CHECK = cls.__NODES_PER_STOP_CHECK
+        # Cells moved into so far.
+        path = []
+
+        def visit(pos: int, remaining: int, check_connected: bool) -> bool:
+            nonlocal nodes
+            nodes += 1
+            if nodes > node_limit: raise ValueError
+            if should_stop is not None and nodes % NODES_PER_STOP_CHECK == 0 and should_stop():
+                raise ValueError
+            if remaining == 0: return True
+            if not FloorPruner.can_finish(width, height, pos, remaining, check_connected): return False
+
+            moves = neighbours[pos] & remaining
+            targets = []
+            while moves:
+                bit = moves & -moves
+                moves ^= bit
+                targets.append(bit.bit_length() - 1)
+
+            targets.sort(key=lambda index: (neighbours[index] & remaining).bit_count())
+            for index in targets:
+                # Painting a cell with one empty neighbour can't split up the empty cells.
+                after = remaining & ~(1 << index)
+                path.append(index)
+                if visit(index, after, (neighbours[index] & after).bit_count() > 1): return True
+                path.pop()
+            return False
+
+        if visit(start, remaining, False): return path
+        return None
@@ -9,8 +9,8 @@ from ..game.painter_visual import PainterVisual
 
 from .autofloor_visual import AutoFloorVisual
 from .cursor_visual import CursorVisual
-from .gui_visual import EditorButtonsVisual
 from .editor_floor_manager import EditorFloorManager
+from .autosaver import Autosaver
 
 class EditControl(KeyboardInputHandler):
     _ACTIONS = {
@@ -46,12 +46,16 @@ class EditControl(KeyboardInputHandler):
 
     @classmethod
     def init(cls, RESIZE_ID: str, SAVE_ID: str, EXIT_ID: str, TEST_ID: str):
-        cls.__floor = EditorFloorManager.get_floor_being_edited()
+        # Floors in the floorpack aren't changed in place: see EditorFloorManager.get_floor_being_edited().
+        cls.__floor = EditorFloorManager.get_floor_being_edited().clone()
         cls.__grid = cls.__floor.get_cell_grid()
         FloorVisual.new_floor(cls.__floor, editor=True)
         cell_dimens = FloorVisual.get_cell_dimens_no_line()
         PainterVisual.new_floor(cls.__floor, cell_dimens)
         cls.__changes_made = False
+        # Whether cells dragged over with the left button held are painted or unpainted,
+        # matching the cell it was pressed on, or None when not dragging.
+        cls.__drag_fill = None
 
         cls.__RESIZE_ID = RESIZE_ID
         cls.__TEST_ID = TEST_ID
@@ -86,12 +90,23 @@ class EditControl(KeyboardInputHandler):
                     # If it was, then check whether it was a left or right click.
                     match event.button:
                         case 1:
-                            # Left clicks toggle whether the cell starts painted.
+                            # Left clicks toggle whether the cell starts painted,
+                            # and dragging does the same to the other cells the mouse goes over.
+                            cls.__drag_fill = not cls.__grid[cell_pos].get_full()
                             cls.paint(cell_pos)
+                            FloorVisual.hover(mouse_x, mouse_y)
                         case 3:
                             # Right clicks set the painter's initial position.
                             cls.set_initial_pos(cell_pos)
-                    EditorButtonsVisual.set_savebutton_text(just_saved=False)
+            case pg.MOUSEMOTION:
+                if not event.buttons[0]: cls.__drag_fill = None
+                # Only look at the cell when the mouse goes into a different one.
+                if FloorVisual.hover(*event.pos) and cls.__drag_fill is not None:
+                    cell_pos = FloorVisual.get_hovered_cell()
+                    if cell_pos is not None and cls.__grid[cell_pos].get_full() != cls.__drag_fill:
+                        cls.paint(cell_pos, silent=True)
+            case pg.MOUSEBUTTONUP:
+                if event.button == 1: cls.__drag_fill = None
             case _:
                 return cls._process_keyboard_input(cls, event)
 
@@ -100,24 +115,26 @@ class EditControl(KeyboardInputHandler):
         SFXPlayer.play_sfx('menu')
         # Store current changes to the floor,
         # so ResizeFloorState can access the right FloorData object.
-        EditorFloorManager.edit_floor(cls.__floor)
+        Autosaver.leave_floor()
         return 'ResizeFloorState'
     
     @classmethod
     def playtest(cls):
         SFXPlayer.play_sfx('start')
+        # Likewise for FloorPlaytestState.
+        Autosaver.leave_floor()
         return 'FloorPlaytestState'
     
     @classmethod
     def save(cls):
         SFXPlayer.play_sfx('start')
-        EditorFloorManager.edit_floor(cls.__floor)
-        EditorFloorManager.save_floorpack()
-        EditorButtonsVisual.set_savebutton_text(just_saved=True)
+        # Written in the background: the save button shows when it's done.
+        Autosaver.save_now(cls.__floor)
 
     @classmethod
     def exit(cls):
         SFXPlayer.play_sfx('back')
+        Autosaver.leave_floor()
         if cls.__changes_made:
             # Unused currently. __changes_made is never set.
             return 'ConfirmExitState'
@@ -133,7 +150,9 @@ class EditControl(KeyboardInputHandler):
         CursorVisual.move_cursor(direction)
     
     @classmethod
-    def paint(cls, cell_pos: tuple=None):
+    def paint(cls, cell_pos: tuple=None, silent: bool=False):
+        '''Toggle whether the cell at the given position (or the cursor's) starts painted.
+        If it can't be painted, play the 'invalid' sfx, unless silent is True (e.g. when dragging).'''
         cell_pos = cell_pos or CursorVisual.get_pos()
         if cell_pos is not None:
             cell = cls.__grid[cell_pos]
@@ -142,13 +161,15 @@ class EditControl(KeyboardInputHandler):
                 SFXPlayer.play_sfx('back')
                 cell.revert()
                 AutoFloorVisual.update(cls.__floor)
+                Autosaver.floor_changed(cls.__floor)
             elif cls.__grid.get_num_empty_cells() > 2 and \
             cell_pos != cls.__floor.get_initial_painter_position():
                     # Paint cell
                     SFXPlayer.play_sfx('move')
                     cell.start_filled()
                     AutoFloorVisual.update(cls.__floor)
-            else: SFXPlayer.play_sfx('invalid')
+                    Autosaver.floor_changed(cls.__floor)
+            elif not silent: SFXPlayer.play_sfx('invalid')
 
     @classmethod
     def set_initial_pos(cls, cell_pos: tuple=None):
@@ -157,4 +178,5 @@ class EditControl(KeyboardInputHandler):
             SFXPlayer.play_sfx('start')
             PainterVisual.go_to(cell_pos)
             cls.__floor.set_initial_painter_position(cell_pos)
-            AutoFloorVisual.update(cls.__floor)
\ No newline at end of file
+            AutoFloorVisual.update(cls.__floor)
+            Autosaver.floor_changed(cls.__floor)
\ No newline at end of file
@@ -2,6 +2,10 @@ from ..app import App
 from ..config import OnlineConfig
 from .gui_handler import GUIHandler
 from .upload import FloorpackUploader
+from .autofloor_visual import AutoFloorVisual
+from .autosaver import Autosaver
+from .solver_worker import SolverWorker
+from .solution_cache import SolutionCache
 from . import editor_states
 
 class Editor(App):
@@ -13,9 +17,24 @@ class Editor(App):
         size = window.get_size()
         GUIHandler.init(size)
         if OnlineConfig.is_online(): FloorpackUploader.init()
+        else: SolutionCache.load()
+
+    def loop(self):
+        output = super().loop()
+        # Stop the solver's worker processes when leaving the editor,
+        # and keep what it worked out for next time.
+        if output is not None:
+            SolverWorker.shutdown()
+            # Finish saving the floor being edited.
+            Autosaver.flush()
+            if not OnlineConfig.is_online(): SolutionCache.save()
+        return output
 
     def _other_event_processing(self, e):
         GUIHandler.process_event(e)
 
     def _use_delta(self, dt):
-        GUIHandler.update(dt)
\ No newline at end of file
+        GUIHandler.update(dt)
+        # Pick up results from the solver and saves running in the background.
+        AutoFloorVisual.poll()
+        Autosaver.poll()
\ No newline at end of file
@@ -1,11 +1,24 @@
-import yaml
 from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor
+from ..config import OnlineConfig
 from ..floor_manager import FloorManager
+from ..floorpack_format import FloorpackFormat
+from ..binary_floorpack import BinaryFloorpack
+from ..floorpack_journal import FloorpackJournal
 from ..file_utility import FileUtility
 from .floor_data import FloorData
 from .autofloor_visual import AutoFloorVisual
 
 class EditorFloorManager(FloorManager):
+    # Floorpack IDs to the pack being edited and the changes made to it since it was saved,
+    # as FloorpackJournal records.
+    __pending = {}
+    # Thread that writes floorpack files, one save at a time, in the order they were made.
+    __writer = None
+    # Set if a save failed part way through, so the next save writes the whole floorpack.
+    # Only used by the writer thread.
+    __compact_next = False
+
     @classmethod
     def create_floorpack(cls, name: str):
         '''Create a floorpack with the given name,
@@ -26,13 +39,30 @@ class EditorFloorManager(FloorManager):
         path_for_pack = path_for_pack.as_posix()
         # Save one default floor to the file.
         with open(path_for_pack, 'x') as file:
-            yaml.dump(pack, file)
+            FloorpackFormat.dump(pack, file)
+        # In case a floorpack with this name was deleted before, keep its changes out of the way.
+        if FloorpackJournal.is_stale(Path(path_for_pack)): FloorpackJournal.set_aside(Path(path_for_pack))
 
         print ('Saved')
         cls._floor_packs[name] = pack
         cls.select_floorpack(name)
         cls.select_floor_to_edit(0)
 
+    @classmethod
+    def select_floorpack(cls, pack_name: str):
+        '''Floors will be chosen from the floorpack with this name.
+        A BinaryFloorpack can't be changed, so its floors are read into a list to be edited.
+        (Any YAML floorpack may be a BinaryFloorpack, from CompiledPackCache.)
+        Raises TypeError if the floorpack or any of its floors can't be read: see _get_floorpack().'''
+        pack = cls._get_floorpack(pack_name)
+        if isinstance(pack, BinaryFloorpack):
+            try: cls._floor_packs[pack_name] = list(pack)
+            except TypeError:
+                cls._forget_invalid_floorpack(pack_name)
+                raise
+            finally: pack.close()
+        super().select_floorpack(pack_name)
+
     @classmethod
     def create_floor(cls):
         '''Create a 3x3 floor where the painter starts at 0,0.
@@ -41,6 +71,7 @@ class EditorFloorManager(FloorManager):
         floor = cls.__default_floor()
         pack = cls._floor_packs[cls._current_pack_id]
         pack.append(floor)
+        cls.__record({'op' : 'insert', 'index' : len(pack) - 1, 'floor' : FloorpackFormat.floor_to_data(floor)})
         cls.select_floor_to_edit(len(pack) - 1)
     
     @classmethod
@@ -57,6 +88,18 @@ class EditorFloorManager(FloorManager):
         pack = cls._floor_packs[cls._current_pack_id]
         floor = pack.pop(from_index)
         pack.insert(to_index, floor)
+        cls.__record({'op' : 'move', 'from' : from_index, 'to' : to_index})
+
+    @classmethod
+    def __record(cls, record: dict):
+        '''Remember a change to the current floorpack, to be saved by save_floorpack().'''
+        pack = cls._floor_packs[cls._current_pack_id]
+        pending_pack, records = cls.__pending.get(cls._current_pack_id, (None, None))
+        if pending_pack is not pack:
+            # The pack has been read from its file again since.
+            records = []
+            cls.__pending[cls._current_pack_id] = (pack, records)
+        records.append(record)
 
     @classmethod
     def select_floor_to_edit(cls, index: int):
@@ -69,7 +112,9 @@ class EditorFloorManager(FloorManager):
     
     @classmethod
     def get_floor_being_edited(cls):
-        '''Return the floor data at the index previously passed to select_floor_to_edit().'''
+        '''Return the floor data at the index previously passed to select_floor_to_edit().
+        Floors in a floorpack are never changed in place (they may be being saved in the background),
+        so to change it, change a clone of it and pass that to edit_floor().'''
         pack = cls._floor_packs[cls._current_pack_id]
         return pack[cls.__floor_index_being_edited]
     
@@ -78,12 +123,17 @@ class EditorFloorManager(FloorManager):
         '''Store the given FloorData object at the index
         previously chosen by select_floor_to_edit().
         Does not actually write the floor data to the floorpack file:
-        call save_floorpack() to do that.'''
+        call save_floorpack() to do that.
+        A clone is stored, so the given object can go on being changed.'''
         # Remove data about empty cells: it has no effect on gameplay,
         # and unnecessarily increases the size of the floorpack file.
         grid = floor_data_obj.get_cell_grid()
         grid.prune_empty_cells()
-        cls._floor_packs[cls._current_pack_id][cls.__floor_index_being_edited] = floor_data_obj
+        cls._floor_packs[cls._current_pack_id][cls.__floor_index_being_edited] = floor_data_obj.clone()
+        cls.__record({
+            'op' : 'set', 'index' : cls.__floor_index_being_edited,
+            'floor' : FloorpackFormat.floor_to_data(floor_data_obj),
+        })
 
     @classmethod
     def select_floor_to_move(cls, index: int):
@@ -110,21 +160,107 @@ class EditorFloorManager(FloorManager):
     @classmethod
     def delete_selected_floor(cls):
         del cls._floor_packs[cls._current_pack_id][cls.__floor_index_to_delete]
+        cls.__record({'op' : 'delete', 'index' : cls.__floor_index_to_delete})
 
     @classmethod
-    def save_floorpack(cls):
-        '''Save the current floorpack into a YAML file in the resources/floors directory.
-        Does not check whether the file exists or not, though,
-        in order to have selected the floorpack, the file must exist.
-        Returns the absolute path the floorpack was saved to.'''
+    def save_floorpack(cls, compact: bool=False):
+        '''Save the current floorpack into its file in the resources/floors directory:
+        a YAML file, or a binary file if it was loaded from one.
+        Waits for the file to be written: see save_floorpack_in_background().
+        Returns the absolute path of the floorpack file.'''
+        return cls.save_floorpack_in_background(compact).result()
 
-        floorpack_dir = FileUtility.path_to_resource_directory('floors')
-        pack_path = (floorpack_dir / (cls._current_pack_id + '.yaml')).resolve().as_posix()
+    @classmethod
+    def save_floorpack_in_background(cls, compact: bool=False) -> Future:
+        '''Start saving the current floorpack as it is now, and return a Future
+        whose result is the absolute path of the floorpack file, once it's been written.
+        Only the list of floors is copied here: the files are written by another thread,
+        after any saves started before. In the web version, they're written straight away.
+
+        Usually only the changes since it was last saved are written, to its FloorpackJournal,
+        so saving a small change to a big floorpack is quick.
+        The whole floorpack is written instead if compact is True (e.g. so the file can be downloaded),
+        if the journal is too big, or if the file doesn't exist yet (e.g. it was uploaded).
+        close_floorpack() writes the whole floorpack, so the file itself has every change.'''
+        return cls.__start_write(cls.__write, compact)
 
+    @classmethod
+    def close_floorpack(cls) -> Future | None:
+        '''Start writing the whole current floorpack to its file, if it has changes
+        that are only in its journal or haven't been saved yet, so the file in resources/floors
+        has every change (e.g. to be shared). Called when leaving the floorpack and the editor.
+        Returns a Future like save_floorpack_in_background(), or None if no floorpack is selected.'''
+        if cls._current_pack_id not in cls._floor_packs: return None
+        return cls.__start_write(cls.__write_if_changed, False)
+
+    @classmethod
+    def __start_write(cls, write, compact: bool) -> Future:
+        '''Copy the current floorpack and the changes made to it since it was last saved,
+        and call write() with them on the writer thread. Return a Future for its result.'''
         pack = cls._floor_packs[cls._current_pack_id]
-        with open(pack_path, 'w') as file:
-            yaml.dump(pack, file)
-        return pack_path
+        pack_path = cls._get_floorpack_path(cls._current_pack_id)
+        if pack_path is None:
+            floorpack_dir = FileUtility.path_to_resource_directory('floors')
+            pack_path = floorpack_dir / (cls._current_pack_id + '.yaml')
+
+        pending_pack, records = cls.__pending.get(cls._current_pack_id, (None, []))
+        cls.__pending[cls._current_pack_id] = (pack, [])
+        # The records don't cover changes made before the pack was read from its file again.
+        compact = compact or pending_pack is not pack
+        # Floors aren't changed in place, so copying the list is enough.
+        args = (pack_path, list(pack), records, compact)
+
+        writer = cls.__get_writer()
+        if writer is not None: return writer.submit(write, *args)
+        future = Future()
+        try: future.set_result(write(*args))
+        except Exception as e: future.set_exception(e)
+        return future
+
+    @classmethod
+    def wait_for_saves(cls):
+        '''Wait until every save started by save_floorpack_in_background() has finished.'''
+        if cls.__writer is not None: cls.__writer.submit(lambda: None).result()
+
+    @classmethod
+    def __write(cls, pack_path, floors: list, records: list, compact: bool) -> str:
+        '''Write a save started by save_floorpack_in_background(), and return the path of the file.'''
+        pack_path = pack_path.resolve()
+        if not (compact or cls.__compact_next) and pack_path.exists():
+            if not records or FloorpackJournal.append(pack_path, records):
+                return pack_path.as_posix()
+
+        if pack_path.suffix == BinaryFloorpack.EXTENSION:
+            write = lambda temp_path: BinaryFloorpack.save(floors, temp_path)
+        else:
+            def write(temp_path):
+                with open(temp_path.as_posix(), 'w') as file:
+                    FloorpackFormat.dump(floors, file)
+        # If this fails, the records are lost, so the journal can't be added to.
+        cls.__compact_next = True
+        FloorpackJournal.compact(pack_path, write)
+        cls.__compact_next = False
+        return pack_path.as_posix()
+
+    @classmethod
+    def __write_if_changed(cls, pack_path, floors: list, records: list, _) -> str:
+        '''Write the whole floorpack for close_floorpack(), if it's been changed, and return the path of the file.'''
+        pack_path = pack_path.resolve()
+        if records or cls.__compact_next or not pack_path.exists() or FloorpackJournal.has_changes(pack_path):
+            return cls.__write(pack_path, floors, records, True)
+        return pack_path.as_posix()
+
+    @classmethod
+    def __get_writer(cls):
+        '''Return the thread that writes floorpack files, starting it on first use.
+        Return None if files should be written straight away.'''
+        if OnlineConfig.is_online(): return None
+        if cls.__writer is None:
+            try: cls.__writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='floorpack-writer')
+            except RuntimeError as e:
+                print ('Unable to start floorpack writer thread, saving straight away instead:', e)
+                return None
+        return cls.__writer
     
     @classmethod
     def upload_floorpack(cls, path_str: str, fname: str):
@@ -135,8 +271,8 @@ class EditorFloorManager(FloorManager):
         and TypeError if the file isn't a floorpack.'''
         path = Path(path_str)
         pack_id = cls.get_packname(fname)
-        if pack_id in cls._floor_packs:
+        if pack_id in cls.get_floorpack_names():
             raise FileExistsError
         
-        cls._load_floorpack(path, floorpack_id=pack_id)
+        cls._load_floorpack(path, fname=fname, floorpack_id=pack_id)
         cls.select_floorpack(pack_id)
\ No newline at end of file
@@ -3,6 +3,7 @@ import platform
 
 from ..abstract_handlers import KeyboardInputHandler, ArbitraryOptionsControlWithBackButton
 from ..audio_utility import SFXPlayer
+from ..error_report import ErrorReportControl
 from .editor_floor_manager import EditorFloorManager
 from .upload import FloorpackUploader
 
@@ -32,8 +33,12 @@ class EditFloorpacksControl(ArbitraryOptionsControlWithBackButton):
             return 'UploadPromptState'
 
         # Edit floorpack.
+        try: EditorFloorManager.select_floorpack(self._option_id)
+        except TypeError:
+            # The file has changed since the editor started: it's no longer on the menu.
+            ErrorReportControl.set_state_after_dismiss('EditFloorpacksState')
+            return 'ErrorState'
         SFXPlayer.play_sfx('start')
-        EditorFloorManager.select_floorpack(self._option_id)
         return 'EditFloorsState'
     
     @classmethod
@@ -65,7 +70,8 @@ class EditFloorsControl(ArbitraryOptionsControlWithBackButton):
         
         if self.__can_download and self._option_id == self.__download_option:
             SFXPlayer.play_sfx('menu')
-            pack_path = EditorFloorManager.save_floorpack()
+            # Write out the whole floorpack, so the downloaded file has every change.
+            pack_path = EditorFloorManager.save_floorpack(compact=True)
             platform.window.MM.download(pack_path)
             return
         match self._option_id:
@@ -89,6 +95,13 @@ class EditFloorsControl(ArbitraryOptionsControlWithBackButton):
                 EditorFloorManager.select_floor_to_edit(floor_index)
                 return 'EditState'
 
+    @classmethod
+    def back(cls):
+        # Changes are saved to the floorpack's journal as it's edited:
+        # write them into the floorpack file itself when leaving it.
+        EditorFloorManager.close_floorpack()
+        return super().back()
+
 class MoveFloorControl(ArbitraryOptionsControlWithBackButton):
     # If the back option is selected, go back to selecting a floor to edit.
     _STATE_AFTER_BACK = 'EditFloorsState'
@@ -1,5 +1,3 @@
-from copy import deepcopy
-
 from ..abstract_states import State, GameContentSelectState
 from ..error_report import ErrorState, ErrorReportControl
 from ..config import OnlineConfig
@@ -7,6 +5,8 @@ from ..game.menu_visual import MenuVisual
 from ..game.painter_visual import PainterVisual
 from ..game.floor_visual import FloorVisual
 from ..game.floor_player import FloorPlayer
+from ..game.hint_visual import HintVisual
+from ..game.dead_end_visual import DeadEndVisual
 from .editor_floor_manager import EditorFloorManager
 from .gui_handler import GUIHandler
 from .editor_floorselect_input import EditFloorpacksControl, EditFloorsControl, MoveFloorControl, FloorDestinationControl, \
@@ -156,11 +156,14 @@ class EditState(State):
     __TEST_ID = 'Test'
     __SAVE_ID = 'Save'
     __SAVED_TEXT = 'Floor saved!'
+    __SAVING_TEXT = 'Saving...'
+    __FAILED_TEXT = 'Save failed!'
     __EXIT_ID = 'Exit'
 
     @classmethod
     def enter(cls):
-        EditorButtonsVisual.init(cls.__RESIZE_ID, cls.__SAVE_ID, cls.__EXIT_ID, cls.__TEST_ID, cls.__SAVED_TEXT)
+        EditorButtonsVisual.init(cls.__RESIZE_ID, cls.__SAVE_ID, cls.__EXIT_ID, cls.__TEST_ID,
+                                 cls.__SAVED_TEXT, cls.__SAVING_TEXT, cls.__FAILED_TEXT)
         EditControl.init(cls.__RESIZE_ID, cls.__SAVE_ID, cls.__EXIT_ID, cls.__TEST_ID)
         CursorVisual.init(EditorFloorManager.get_floor_being_edited())
 
@@ -179,14 +182,16 @@ class ResizeFloorState(State):
 
 class FloorPlaytestState(State):
     _INPUT_HANDLER = PlaytestControl
-    _VISUAL_HANDLERS = (FloorVisual, PainterVisual, ReturnToEditorButtonVisual)
+    _VISUAL_HANDLERS = (FloorVisual, HintVisual, DeadEndVisual, PainterVisual, ReturnToEditorButtonVisual)
 
     @staticmethod
     def enter():
         GUIHandler.clear_elements()
-        floor = deepcopy(EditorFloorManager.get_floor_being_edited())
+        floor = EditorFloorManager.get_floor_being_edited().clone()
         FloorVisual.new_floor(floor)
         FloorPlayer.new_floor(floor)
+        HintVisual.clear()
+        DeadEndVisual.check()
         cell_dimens = FloorVisual.get_cell_dimens_no_line()
         PainterVisual.new_floor(floor, cell_dimens)
 
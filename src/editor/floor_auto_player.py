@@ -1,135 +1,111 @@
-from ..game.floor_player import FloorPlayer
-from copy import deepcopy
+import time
+from itertools import islice
+from .bitboard_solver import BitboardSolver
+from .floor_pruner import FloorPruner
+from .frontier_counter import FrontierCounter
+from .solution_cache import SolutionCache
 
-class FloorAutoPlayer(FloorPlayer):
-    # Maximums on number of empty cells.
-    __USE_ONLY_HEURISTIC_ABOVE = 25
-    __NO_SOLUTIONCOUNT_ABOVE = 18
+class FloorAutoPlayer:
+    '''Works out whether floors can be cleared, and how many ways there are to do it.
+    Nothing is kept between calls apart from SolutionCache,
+    so solving doesn't affect the floor being played or edited.'''
+
+    # Maximum on number of empty cells.
+    __USE_ONLY_HEURISTIC_ABOVE = 64
+
+    # Maximum on number of positions visited by the solver
+    # before giving up, so the editor doesn't freeze.
+    __POSSIBLE_NODE_LIMIT = 200000
 
     __MAX_DEGREE = 4
 
     @classmethod
-    def is_possible(cls, floor_obj) -> bool:
+    def is_possible(cls, floor_obj, should_stop=None) -> bool:
         '''Return whether it is possible to clear the floor, using depth-first traversal.
-        If the floor has enough empty cells that this would be overly time-consuming, raise ValueError.'''
+        Quick checks from is_possible_heuristic() are tried first.
+        If the floor has enough empty cells that this would be overly time-consuming,
+        or the traversal gives up part way through, raise ValueError.
+        should_stop(), if given, is called every so often: if it returns True, the traversal gives up.
+        Results are kept in SolutionCache, along with a solution if one is found.'''
+        cached = SolutionCache.lookup(floor_obj).get('possible')
+        if cached is not None: return cached
+
+        heuristic = cls.is_possible_heuristic(floor_obj)
+        if heuristic is not None:
+            SolutionCache.store(floor_obj, possible=heuristic)
+            return heuristic
+
         empty_cells = floor_obj.get_cell_grid().get_num_empty_cells()
         if empty_cells > cls.__USE_ONLY_HEURISTIC_ABOVE:
             raise ValueError
-        
-        is_defo_possible = cls.is_possible_heuristic(floor_obj)
-        if is_defo_possible: return True
 
-        return cls.__traverse(floor_obj)
+        solution = BitboardSolver.find_solution(floor_obj, cls.__POSSIBLE_NODE_LIMIT, should_stop)
+        if solution is None: SolutionCache.store(floor_obj, possible=False)
+        else: SolutionCache.store(floor_obj, possible=True, witness=solution)
+        return solution is not None
     
     @classmethod
-    def num_solutions(cls, floor_obj) -> int:
-        '''Return the number of solutions for the floor, using depth-first traversal.
-        If the floor has enough empty cells that this would be overly time-consuming, raise ValueError.'''
-        if floor_obj.get_cell_grid().get_num_empty_cells() > cls.__NO_SOLUTIONCOUNT_ABOVE:
-            raise ValueError
-        
+    def num_solutions(cls, floor_obj, should_stop=None) -> int:
+        '''Return the number of solutions for the floor, using dynamic programming
+        over a frontier of cells, so solutions are counted without being listed.
+        If the floor is open enough that this would be overly time-consuming, raise ValueError,
+        as is done if should_stop() is given and returns True when it's called every so often.
+        Results are kept in SolutionCache.'''
         #print ('Counting solutions')
-        return cls.__traverse(floor_obj, find_all_solutions=True)
+        cached = SolutionCache.lookup(floor_obj).get('solutions')
+        if cached is not None: return cached
+
+        num = FrontierCounter.num_solutions(floor_obj, should_stop)
+        SolutionCache.store(floor_obj, possible=num > 0, solutions=num)
+        return num
     
+    @classmethod
+    def iter_solutions(cls, floor_obj, limit: int=None, timeout: float=None):
+        '''Yield solutions for the floor one at a time, as lists of directions,
+        without keeping them all in memory.
+        Stop after limit solutions, or after timeout seconds, if given:
+        in which case there may be solutions that weren't yielded.'''
+        deadline = None
+        if timeout is not None: deadline = time.perf_counter() + timeout
+        return islice(BitboardSolver.iter_solutions(floor_obj, deadline), limit)
+
     @classmethod
     def is_possible_heuristic(cls, floor_obj) -> bool | None:
         '''Return True if it is definitely possible to clear the floor,
-        and None if it is uncertain whether it's possible or not.'''
+        False if it definitely isn't, and None if it is uncertain whether it's possible or not.
+        Only quick checks are made, rather than searching for a solution.'''
         #print ('Checking heuristic')
-        if cls.__is_possible_dirac(floor_obj): return True
+        width, height, empty, start = BitboardSolver.encode(floor_obj)
+        remaining = empty & ~(1 << start)
+        neighbours = BitboardSolver.neighbour_masks(width, height)
+
+        if not FloorPruner.parity_allows(width, height, start, remaining): return False
+        if not FloorPruner.can_finish(width, height, start, remaining): return False
+        if FloorPruner.has_splitting_cell(neighbours, empty): return False
+        if cls.__is_possible_dirac(neighbours, empty): return True
         return None
     
     @classmethod
-    def __is_possible_dirac(cls, floor_obj) -> bool:
-        '''Return whether or not it is possible to clear the floor,
-        using Dirac's Theorem.'''
-        cls.new_floor(floor_obj)
-        width, height = cls._grid.get_size()
-        num_cells = (width * height)
-        #if num_cells < 3: return True
+    def __is_possible_dirac(cls, neighbours: tuple[int], empty: int) -> bool:
+        '''Return True if Dirac's Theorem shows it is possible to clear the floor:
+        if every empty cell has at least half as many empty neighbours as there are empty cells,
+        there's a loop through all of them, so the painter can start anywhere.
+        Return False if the theorem doesn't apply.
+        Assumes the empty cells are connected.'''
+        num_cells = empty.bit_count()
+        # One or two connected cells can always be cleared.
+        if num_cells < 3: return True
 
-        half_num_cells = num_cells // 2
-        #print (f'Half number of cells: {half_num_cells}')
-        if half_num_cells > cls.__MAX_DEGREE: return False
+        # A cell can't have more than 4 neighbours,
+        # so there's no point checking for more than 8 cells.
+        if num_cells > cls.__MAX_DEGREE * 2: return False
 
-        for x in range(width):
-            for y in range(height):
-                degree = cls.__degree_of((x,y))
-                #print (f'Degree of {x},{y} : {degree} {degree < half_num_cells}')
-                if degree < half_num_cells:
-                    return False
+        cells = empty
+        while cells:
+            bit = cells & -cells
+            cells ^= bit
+            degree = (neighbours[bit.bit_length() - 1] & empty).bit_count()
+            #print (f'Degree of {bit.bit_length() - 1} : {degree}')
+            if degree * 2 < num_cells:
+                return False
         return True
-
-    @classmethod
-    def __traverse(cls, floor_obj, find_all_solutions: bool=False) -> int | bool:
-        cls.new_floor(deepcopy(floor_obj))
-
-        successors = [] # Alternative moves not yet tried
-        running = True
-        if find_all_solutions: num_solutions = 0
-        else: found_solution = False
-
-        def reverse():
-            output = None
-            while output is None:
-                # Undo
-                if cls.undo() is None:
-                    # If nothing to undo, floor is impossible
-                    output = False
-                else:
-                    # Check for alternative moves
-                    # in previous list.
-                    if len(successors[-1]) == 0:
-                        # No alternate move, undo again
-                        del successors[-1]
-                    else:
-                        # Alternate move found, do it
-                        new_pos = successors[-1].pop()
-                        cls.move_painter(new_pos)
-                        output = True
-            return output
-
-        while running:
-            #print (cls._painter_pos, successors)
-            if cls._grid.is_painted():
-                # Solution found, look for alternative moves
-                if find_all_solutions:
-                    num_solutions += 1
-                    running = reverse()
-                else:
-                    found_solution = True
-                    running = False
-            else:
-                # List potential moves from here.
-                moves = cls.__valid_moves_from(cls._painter_pos)
-                if len(moves) > 0:
-                    # Do an arbitrary move (the last).
-                    new_pos = moves.pop()
-                    cls.move_painter(new_pos)
-
-                    # Store the alternative moves that were possible.
-                    successors.append(moves)
-                else:
-                    # Find alternate move
-                    running = reverse()
-                    
-        #print (output)
-        return num_solutions if find_all_solutions else found_solution
-    
-    @classmethod
-    def __empty_cells_only(cls, cell_positions: set[tuple[int]]):
-        full_cell_positions = cls._grid.get_full_cell_positions()
-        
-        return {
-            pos for pos in cell_positions
-            if pos not in full_cell_positions
-        }
-    
-    @classmethod
-    def __valid_moves_from(cls, pos: tuple[int]=None):
-        adjacents = cls.adjacents_to(pos)
-        return cls.__empty_cells_only(adjacents)
-    
-    @classmethod
-    def __degree_of(cls, pos: tuple[int]=None):
-        return len(cls.__valid_moves_from(pos))
\ No newline at end of file
@@ -2,6 +2,9 @@ class FloorData:
     '''Class representing a level. A level consists of a grid of cells
     and an initial position for the painter.'''
 
+    __MIN_DIMENS = 1
+    __MAX_DIMENS = 8
+
     def __init__(self, cell_width: int, cell_height: int):
         self.__grid = CellGrid(cell_width, cell_height)
         self.__initial_painter_position = (0,0)
@@ -18,6 +21,18 @@ class FloorData:
 
     def get_cell_grid(self):
         return self.__grid
+
+    def clone(self):
+        '''Return a copy of this floor that can be changed (e.g. played)
+        without changing this one. This is much quicker than deepcopy().'''
+        floor = FloorData.__new__(FloorData)
+        floor.__grid = self.__grid.clone()
+        # Tuples can't be changed, so it's fine to share the position.
+        floor.__initial_painter_position = self.__initial_painter_position
+        return floor
+
+    def __deepcopy__(self, memo: dict):
+        return self.clone()
     
     def resize(self, new_width: int, new_height: int):
         '''Change the dimensions of the floor to the new width and height.
@@ -44,8 +59,8 @@ class FloorData:
         and disallow both width and height being 1.
         If the width is None, fall back on the default width, same with height.'''
 
-        MIN_DIMENS = 1
-        MAX_DIMENS = 8
+        MIN_DIMENS = self.__MIN_DIMENS
+        MAX_DIMENS = self.__MAX_DIMENS
         if width is None: width = default_w
         else: width = min(max(MIN_DIMENS, width),MAX_DIMENS)
         if height is None: height = default_h
@@ -53,14 +68,31 @@ class FloorData:
         if width == height == 1: width = 2
         return (width, height)
 
+    @classmethod
+    def is_valid_size(cls, width: int, height: int):
+        '''Return whether a floor can have the given width and height:
+        both between 1 and 8, and not both 1.
+        Used to check floorpack files.'''
+        return cls.__MIN_DIMENS <= width <= cls.__MAX_DIMENS and \
+            cls.__MIN_DIMENS <= height <= cls.__MAX_DIMENS and \
+            not width == height == 1
+
 class CellGrid:
     '''Class representing a grid of cells, the main part of a level.
-    Instances may be indexed to get the cell at a position.'''
+    Instances may be indexed to get the cell at a position.
+
+    Which cells are full is stored as a bitmask, with the cell at x,y
+    at bit y * width + x, along with a count of the full cells.
+    So checking whether the level is complete, or how many cells are empty,
+    doesn't need to look at every cell.'''
+
+    __slots__ = ('__w', '__h', '__full', '__num_full')
 
     def __init__(self, width: int, height: int):
         self.__w = width
         self.__h = height
-        self.__cells = {}
+        self.__full = 0
+        self.__num_full = 0
 
     def ensure_valid_position(self, pos: tuple):
         '''Ensure a tuple represents a position in this cell grid.
@@ -82,18 +114,12 @@ class CellGrid:
 
     def __getitem__(self, pos: tuple):
         '''Return the cell object at the given position.
-        When a position is accessed for the first time,
-        the cell object will be created before returning it.
+        The cell object is a view onto this grid, so changing it changes the grid.
         Raise an exception if the position is not within the level.'''
 
         self.ensure_valid_position(pos)
-
-        if pos in self.__cells:
-            return self.__cells[pos]
-
-        new_cell = Cell()
-        self.__cells[pos] = new_cell
-        return new_cell
+        x, y = pos
+        return Cell(self, int(y) * self.__w + int(x))
     
     def get_size(self):
         '''Return the dimensions of this grid.
@@ -102,51 +128,114 @@ class CellGrid:
     
     def get_full_cell_positions(self):
         '''Return a list of positions where cells have been filled.
-        Called when drawing level visuals and in the is_painted() method'''
-        return [pos for pos, cell in self.__cells.items() if cell.get_full()]
+        Called when drawing level visuals'''
+        positions = []
+        full = self.__full
+        while full:
+            bit = full & -full
+            full ^= bit
+            index = bit.bit_length() - 1
+            positions.append((index % self.__w, index // self.__w))
+        return positions
+
+    def get_full_mask(self):
+        '''Return a bitmask of the full cells, with the cell at x,y at bit y * width + x.
+        Called by the solvers.'''
+        return self.__full
     
     def is_painted(self):
         '''Return a boolean indicating whether the level is complete.
         True : All cells are full (except the one the painter ended on)
         False : There are still cells to paint'''
-        #print (f'Checking if over: {self.__w * self.__h}, {len(self.get_full_cell_positions())}')
-        return self.__w * self.__h == len(self.get_full_cell_positions()) + 1
+        return self.__w * self.__h == self.__num_full + 1
     
     def prune_empty_cells(self):
-        '''When cells are not being used in gameplay,
-        data specifying an empty cell is equivalent to no Cell object existing.
-        Therefore, to save space in floorpack files, this method deletes
-        any data specifying empty cells.'''
-        self.__cells = {pos : cell for pos, cell in self.__cells.items() if cell.get_full()}
+        '''Empty cells used to be stored as Cell objects, which took up space in floorpack files.
+        Only full cells are stored now, so there's nothing to do.'''
     
     def get_num_empty_cells(self):
-        return self.__w * self.__h - len(self.get_full_cell_positions())
+        return self.__w * self.__h - self.__num_full
+
+    def clone(self):
+        '''Return a copy of this grid that can be changed without changing this one.
+        The state is a few ints, which can't be changed, so the copy shares them
+        until either grid has a cell painted, and nothing else is allocated.'''
+        grid = CellGrid.__new__(CellGrid)
+        grid.__w = self.__w
+        grid.__h = self.__h
+        grid.__full = self.__full
+        grid.__num_full = self.__num_full
+        return grid
+
+    def __deepcopy__(self, memo: dict):
+        return self.clone()
+
+    def _is_full(self, index: int):
+        '''Return whether the cell at the given index is full. Called by Cell.'''
+        return self.__full >> index & 1 == 1
+
+    def _set_full(self, index: int, full: bool):
+        '''Set whether the cell at the given index is full. Called by Cell.'''
+        if self._is_full(index) == full: return
+        self.__full ^= 1 << index
+        self.__num_full += full and 1 or -1
+
+    def __getstate__(self):
+        '''Return the state in the form a CellGrid used to have, a dictionary of
+        positions to Cell objects, so floorpack files stay the same.'''
+        return {
+            '_CellGrid__cells' : {pos : self[pos] for pos in self.get_full_cell_positions()},
+            '_CellGrid__h' : self.__h,
+            '_CellGrid__w' : self.__w,
+        }
+
+    def __setstate__(self, state: dict):
+        '''Restore the state returned by __getstate__(), e.g. when loading a floorpack.'''
+        self.__init__(state['_CellGrid__w'], state['_CellGrid__h'])
+        for pos, cell in state.get('_CellGrid__cells', {}).items():
+            if cell.get_full(): self[pos].start_filled()
 
 
 class Cell:
     '''Class representing a cell that can be blank or coloured in.
-    The goal of a level is to colour all cells.'''
+    The goal of a level is to colour all cells.
+
+    A cell is a view onto the CellGrid it came from: whether it's full is stored in the grid.
+    A cell made without a grid gets a 1x1 grid of its own.'''
+
+    __slots__ = ('__grid', '__index')
 
-    def __init__(self):
-        self.__filled = False
+    def __init__(self, grid: CellGrid=None, index: int=0):
+        if grid is None: grid = CellGrid(1, 1)
+        self.__grid = grid
+        self.__index = index
 
     def paint(self):
         '''Set cell to be full.
         Called during play, when moving.
         Raises ValueError if the cell is full already'''
-        if self.__filled: raise ValueError
-        self.__filled = True
+        if self.__grid._is_full(self.__index): raise ValueError
+        self.__grid._set_full(self.__index, True)
         return True
 
     def revert(self):
         '''Set cell to be blank.
         Called during play, when undoing.'''
-        self.__filled = False
+        self.__grid._set_full(self.__index, False)
 
     def start_filled(self):
         '''Set cell to start filled in.
         Called during level creation.'''
-        self.__filled = True
+        self.__grid._set_full(self.__index, True)
 
     def get_full(self):
-        return self.__filled
\ No newline at end of file
+        return self.__grid._is_full(self.__index)
+
+    def __getstate__(self):
+        return {'_Cell__filled' : self.get_full()}
+
+    def __setstate__(self, state: dict):
+        '''Restore the state returned by __getstate__(), e.g. when loading a floorpack.
+        The cell gets a grid of its own.'''
+        self.__init__()
+        if state.get('_Cell__filled'): self.start_filled()
@@ -0,0 +1,171 @@
+class FloorPruner:
+    '''Checks used by the solvers to give up on a partly painted floor early,
+    when the empty cells left can't all be painted from the painter's position.
+
+    Cells are bitmasks, as in BitboardSolver. Moving a whole set of cells
+    one step in a direction is done with shifts, so flood fills and degree counts
+    handle every cell at once rather than looping over them.'''
+
+    # Maps (width, height) to the masks used to shift sets of cells.
+    __geometry = {}
+
+    # Maps (width, height) to a mask of the 'black' cells of a checkerboard,
+    # or None if the floor can't be coloured like one.
+    __checkerboards = {}
+
+    @classmethod
+    def __masks_for(cls, width: int, height: int) -> tuple[int]:
+        '''Return the masks for the whole grid, its first and last column,
+        and whether moving horizontally or vertically leads to another cell.
+        Calculated on the first call for a size.'''
+        size = (width, height)
+        if size not in cls.__geometry:
+            full = (1 << (width * height)) - 1
+            first_col = sum(1 << (y * width) for y in range(height))
+            last_col = first_col << (width - 1)
+            cls.__geometry[size] = (full, first_col, last_col, width > 1, height > 1)
+        return cls.__geometry[size]
+
+    @classmethod
+    def __checkerboard_for(cls, width: int, height: int) -> int | None:
+        '''Return a mask of the cells where x + y is even, if every move goes between
+        such a cell and one where x + y is odd, and None otherwise.
+        Wrapping round an odd width or height breaks the pattern (unless it's 1,
+        where there are no moves that way). Calculated on the first call for a size.'''
+        size = (width, height)
+        if size not in cls.__checkerboards:
+            mask = None
+            if (width % 2 == 0 or width == 1) and (height % 2 == 0 or height == 1):
+                mask = 0
+                for y in range(height):
+                    for x in range((y % 2), width, 2):
+                        mask |= 1 << (y * width + x)
+            cls.__checkerboards[size] = mask
+        return cls.__checkerboards[size]
+
+    @classmethod
+    def shifted(cls, width: int, height: int, cells: int) -> list[int]:
+        '''Return the cells one move away from the given cells, as one mask per direction.
+        If two directions lead to the same cells, as when the grid is 2 cells wide,
+        only one mask is included for them, so that neighbours are not counted twice.'''
+        full, first_col, last_col, horizontal, vertical = cls.__masks_for(width, height)
+        row_shift = width * (height - 1)
+        output = []
+        if horizontal:
+            output.append(((cells & ~last_col) << 1) | ((cells & last_col) >> (width - 1)))
+            if width > 2:
+                output.append(((cells & ~first_col) >> 1) | ((cells & first_col) << (width - 1)))
+        if vertical:
+            output.append(((cells << width) & full) | (cells >> row_shift))
+            if height > 2:
+                output.append((cells >> width) | ((cells << row_shift) & full))
+        return output
+
+    @classmethod
+    def spread(cls, width: int, height: int, cells: int) -> int:
+        '''Return all the cells one move away from the given cells.'''
+        output = 0
+        for mask in cls.shifted(width, height, cells):
+            output |= mask
+        return output
+
+    @classmethod
+    def is_connected(cls, width: int, height: int, cells: int) -> bool:
+        '''Return whether all the given cells can be reached from each other
+        by moving only through those cells.'''
+        if cells == 0: return True
+        reached = cells & -cells
+        while True:
+            new_reached = (reached | cls.spread(width, height, reached)) & cells
+            if new_reached == reached: return reached == cells
+            reached = new_reached
+
+    @classmethod
+    def dead_ends(cls, width: int, height: int, cells: int) -> tuple[int]:
+        '''Return a mask of the given cells with no neighbours within the given cells,
+        and a mask of those with exactly one.'''
+        at_least_one = at_least_two = 0
+        for mask in cls.shifted(width, height, cells):
+            at_least_two |= at_least_one & mask
+            at_least_one |= mask
+        return cells & ~at_least_one, cells & at_least_one & ~at_least_two
+
+    @classmethod
+    def parity_allows(cls, width: int, height: int, pos: int, remaining: int) -> bool:
+        '''Return False if the remaining empty cells can't all be painted by a painter
+        at the index pos because of the checkerboard pattern, and True otherwise.
+        Where the floor is coloured like a checkerboard, each move goes to the other colour,
+        so the cells visited alternate between colours starting with the painter's cell.
+        There must be as many cells of the painter's colour as of the other one,
+        or exactly one more.'''
+        black = cls.__checkerboard_for(width, height)
+        if black is None: return True
+        cells = remaining | (1 << pos)
+        same = cells & black
+        if not (1 << pos) & black: same = cells & ~black
+        difference = 2 * same.bit_count() - cells.bit_count()
+        return difference == 0 or difference == 1
+
+    @classmethod
+    def can_finish(cls, width: int, height: int, pos: int, remaining: int, check_connected: bool=True) -> bool:
+        '''Return False if the remaining empty cells definitely can't all be painted
+        by a painter at the index pos, and True if they might be.
+
+        The remaining cells must be connected, since the painter can't cross its own paint.
+        Cells with one empty neighbour can only be painted last, so there can't be more than one.
+
+        If check_connected is False, the remaining cells are assumed to be connected:
+        this is the case when they were connected before the painter's last move
+        and the cell it moved into had at most one empty neighbour.'''
+        if remaining == 0: return True
+        pos_bit = 1 << pos
+        if cls.spread(width, height, pos_bit) & remaining == 0: return False
+
+        isolated, single = cls.dead_ends(width, height, remaining | pos_bit)
+        isolated &= remaining
+        single &= remaining
+        if isolated or (single & (single - 1)): return False
+
+        return not check_connected or cls.is_connected(width, height, remaining)
+
+    @staticmethod
+    def has_splitting_cell(neighbours: tuple[int], cells: int) -> bool:
+        '''Return whether painting any one of the given cells would split the rest
+        into three or more parts, using Tarjan's algorithm for articulation points.
+        If so, the cells can't all be painted in one go, as the painter
+        can only leave one part to go to another once.
+        neighbours should be the neighbour masks from BitboardSolver for the grid size.
+        Assumes the cells are connected.
+
+        This is too slow to be worth doing for every position in a search,
+        so it is used on the starting position only.'''
+        root = (cells & -cells).bit_length() - 1
+        discovered = {root : 0}
+        low = {root : 0}
+        # Number of parts split off from each cell by painting it.
+        parts = {root : 0}
+        stack = [(root, neighbours[root] & cells)]
+
+        while stack:
+            cell, unvisited = stack[-1]
+            if unvisited:
+                bit = unvisited & -unvisited
+                stack[-1] = (cell, unvisited ^ bit)
+                child = bit.bit_length() - 1
+                if child in discovered:
+                    low[cell] = min(low[cell], discovered[child])
+                else:
+                    discovered[child] = low[child] = len(discovered)
+                    parts[child] = 0
+                    stack.append((child, neighbours[child] & cells))
+            else:
+                stack.pop()
+                if stack:
+                    parent = stack[-1][0]
+                    low[parent] = min(low[parent], low[cell])
+                    if low[cell] >= discovered[parent]:
+                        parts[parent] += 1
+                        # Cells other than the root also have the part above them.
+                        limit = parent == root and 3 or 2
+                        if parts[parent] >= limit: return True
+        return False
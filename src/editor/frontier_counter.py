@@ -0,0 +1,185 @@
+from .bitboard_solver import BitboardSolver
+from .floor_pruner import FloorPruner
+
+class FrontierCounter:
+    '''Counts the number of ways to clear a floor without listing them,
+    using dynamic programming over a frontier of cells.
+
+    A solution is a path from the painter's starting cell through every empty cell.
+    An extra 'virtual' cell is added, next to every empty cell: each solution then
+    corresponds to exactly one loop through every cell that uses the virtual cell
+    and the starting cell as neighbours, so loops are counted instead of paths.
+
+    The moves between cells (including those that wrap round the edges of the floor)
+    are considered in order, each being either used or unused. Only cells with moves
+    on both sides of the current one are kept track of: this is the frontier.
+    For each frontier cell, the state records which cell is at the other end of the
+    painted line it is part of, so different combinations of choices that leave the
+    frontier the same way are merged and counted together.'''
+
+    # Used as the mate of a cell that two moves are made across.
+    __USED_TWICE = -1
+
+    # Maximum number of distinct frontier states before giving up.
+    __MAX_STATES = 200000
+
+    @classmethod
+    def num_solutions(cls, floor_obj, should_stop=None) -> int:
+        '''Return the number of solutions for the given floor.
+        If the frontier grows so large that this would be overly time-consuming, raise ValueError.
+        should_stop() is as in count().'''
+        return cls.count(*BitboardSolver.encode(floor_obj), should_stop)
+
+    @classmethod
+    def count(cls, width: int, height: int, empty: int, start: int, should_stop=None) -> int:
+        '''Return the number of paths that start at the start index and visit every cell
+        in the empty bitmask exactly once, on a grid with the given width and height.
+        If the frontier grows so large that this would be overly time-consuming, raise ValueError.
+        should_stop(), if given, is called before each move is considered,
+        and ValueError is raised if it returns True.'''
+        # Don't bother with floors that are quick to rule out.
+        remaining = empty & ~(1 << start)
+        if not FloorPruner.parity_allows(width, height, start, remaining) or \
+        not FloorPruner.can_finish(width, height, start, remaining):
+            return 0
+
+        neighbours = BitboardSolver.neighbour_masks(width, height)
+        cells = cls.__best_order(width, height, neighbours, empty)
+        if len(cells) == 1: return 1
+
+        USED_TWICE = cls.__USED_TWICE
+        MAX_STATES = cls.__MAX_STATES
+        rank = {cell : index for index, cell in enumerate(cells)}
+        # The virtual cell is given an index after all real cells.
+        virtual = width * height
+        num_vertices = len(cells) + 1
+
+        # Number of moves not yet considered for each cell.
+        # A cell needing more moves than it has left can't be part of a loop,
+        # so states where that is the case are dropped early.
+        moves_left = {cell : (neighbours[cell] & empty).bit_count() + 1 for cell in cells}
+        moves_left[virtual] = len(cells)
+
+        # The move between the virtual cell and the starting cell must be used,
+        # so it is made first: the frontier starts with those two cells joined.
+        frontier = [virtual, start]
+        states = {(start, virtual): 1}
+        moves_left[virtual] -= 1
+        moves_left[start] -= 1
+        total = 0
+        # Number of cells that have left the frontier.
+        num_left = 0
+
+        for cell in cells:
+            edges = [other for other in cls.__cells_in(neighbours[cell] & empty)
+                     if rank[other] > rank[cell]]
+            if cell != start: edges.append(virtual)
+
+            for other in edges:
+                if should_stop is not None and should_stop(): raise ValueError
+                # Add cells to the frontier the first time a move touches them.
+                for vertex in (cell, other):
+                    if vertex not in frontier:
+                        frontier.append(vertex)
+                        states = {state + (vertex,): num for state, num in states.items()}
+
+                index_of = {vertex : index for index, vertex in enumerate(frontier)}
+                index_a = index_of[cell]
+                index_b = index_of[other]
+                moves_left[cell] -= 1
+                moves_left[other] -= 1
+                left_a = moves_left[cell]
+                left_b = moves_left[other]
+                all_seen = len(frontier) + num_left == num_vertices
+                new_states = {}
+
+                for state, num in states.items():
+                    mate_a = state[index_a]
+                    mate_b = state[index_b]
+
+                    # Leave the move unused,
+                    # unless either cell would then need more moves than it has left.
+                    if (mate_a == USED_TWICE or (mate_a == cell and 2 or 1) <= left_a) and \
+                    (mate_b == USED_TWICE or (mate_b == other and 2 or 1) <= left_b):
+                        new_states[state] = new_states.get(state, 0) + num
+
+                    # Use the move, if neither cell has been moved across twice.
+                    if mate_a == USED_TWICE or mate_b == USED_TWICE: continue
+
+                    if mate_a == other:
+                        # This move would close a loop. Only count it if it
+                        # finishes a loop through every cell.
+                        if all_seen and all(
+                            mate == USED_TWICE for index, mate in enumerate(state)
+                            if index != index_a and index != index_b):
+                            total += num
+                        continue
+
+                    # A cell with no moves yet needs one more.
+                    if (mate_a == cell and left_a == 0) or (mate_b == other and left_b == 0):
+                        continue
+
+                    new_state = list(state)
+                    if mate_a != cell: new_state[index_a] = USED_TWICE
+                    if mate_b != other: new_state[index_b] = USED_TWICE
+                    new_state[index_of[mate_a]] = mate_b
+                    new_state[index_of[mate_b]] = mate_a
+                    new_state = tuple(new_state)
+                    new_states[new_state] = new_states.get(new_state, 0) + num
+
+                if len(new_states) > MAX_STATES: raise ValueError
+                states = new_states
+
+            # This cell has no more moves, so it leaves the frontier.
+            # Every cell must be moved across twice on a loop.
+            index = frontier.index(cell)
+            del frontier[index]
+            num_left += 1
+            states = {
+                state[:index] + state[index + 1:]: num
+                for state, num in states.items() if state[index] == USED_TWICE
+            }
+            if not states: return total
+        return total
+
+    @staticmethod
+    def __cells_in(mask: int) -> list[int]:
+        '''Return the indexes of the cells in the bitmask, in ascending order.'''
+        cells = []
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            cells.append(bit.bit_length() - 1)
+        return cells
+
+    @classmethod
+    def __best_order(cls, width: int, height: int, neighbours: tuple[int], empty: int) -> list[int]:
+        '''Return the empty cells in the order to consider them.
+        The floor wraps round, so any row or column can be the first one:
+        each row-by-row and column-by-column order is tried, and the order that
+        keeps the frontier smallest is returned. Cutting the floor along a line
+        of full cells is usually best.'''
+        cells = cls.__cells_in(empty)
+        orders = []
+        for first_row in range(height):
+            orders.append(sorted(cells,
+                key=lambda cell: ((cell // width - first_row) % height, cell % width)))
+        for first_col in range(width):
+            orders.append(sorted(cells,
+                key=lambda cell: ((cell % width - first_col) % width, cell // width)))
+
+        def frontier_sizes(order: list[int]) -> tuple[int]:
+            '''Return the largest and total sizes of the frontier for the order.'''
+            rank = {cell : index for index, cell in enumerate(order)}
+            frontier = set()
+            largest = total = 0
+            for cell in order:
+                frontier.add(cell)
+                for other in cls.__cells_in(neighbours[cell] & empty):
+                    if rank[other] > rank[cell]: frontier.add(other)
+                largest = max(largest, len(frontier))
+                total += len(frontier)
+                frontier.discard(cell)
+            return largest, total
+
+        return min(orders, key=frontier_sizes)
@@ -8,6 +8,7 @@ from ..game.floor_visual import FloorVisual
 from ..game.painter_visual import PainterVisual
 from .editor_floor_manager import EditorFloorManager
 from .autofloor_visual import AutoFloorVisual
+from .autosaver import Autosaver
 from .gui_handler import GUIHandler
 
 class FloorpackCreateControl(KeyboardInputHandler):
@@ -127,15 +128,16 @@ class ResizeFloorControl(KeyboardInputHandler):
         new_width = cls.__retrieve_from_field(cls.__WIDTH_FIELD_ID)
         new_height = cls.__retrieve_from_field(cls.__HEIGHT_FIELD_ID)
 
-        # Change size of the current floor grid.
-        floor = EditorFloorManager.get_floor_being_edited()
+        # Change size of a copy of the current floor grid.
+        floor = EditorFloorManager.get_floor_being_edited().clone()
         floor.resize(new_width, new_height)
         FloorVisual.new_floor(floor, editor=True)
         cell_dimens = FloorVisual.get_cell_dimens_no_line()
         PainterVisual.new_floor(floor, cell_dimens)
 
-        # Store changes and return to editing
+        # Store changes, to be saved by Autosaver, and return to editing
         EditorFloorManager.edit_floor(floor)
+        Autosaver.floor_changed(floor)
         AutoFloorVisual.update(floor)
         return 'EditState'
     
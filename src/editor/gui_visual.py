@@ -31,8 +31,13 @@ class EditorButtonsVisual(GUIVisualHandler):
     __BUTTON_WIDTH_FRAC = 1.5
     __BUTTON_HEIGHT_FRAC = 4
 
+    __save_button = None
+    # Shown on the save button, from Autosaver: 'unsaved', 'saving', 'saved', or 'failed'.
+    __save_status = 'unsaved'
+
     @classmethod
-    def init(cls, RESIZE_ID: str, SAVE_ID: str, EXIT_ID: str, TEST_ID: str, SAVED_TEXT: str):
+    def init(cls, RESIZE_ID: str, SAVE_ID: str, EXIT_ID: str, TEST_ID: str,
+             SAVED_TEXT: str, SAVING_TEXT: str, FAILED_TEXT: str):
         GUIHandler.clear_elements()
         # Find position and dimensions of UI container.
         win_w, win_h = cls._window_dimensions
@@ -60,14 +65,16 @@ class EditorButtonsVisual(GUIVisualHandler):
             # Add the width-per-button to shift to the right.
             button_x += width_per_button
         
-        cls.__SAVE_ID = SAVE_ID
-        cls.__SAVED_TEXT = SAVED_TEXT
+        cls.__save_button = GUIHandler.get_elem(SAVE_ID)
+        cls.__STATUS_TEXTS = {'unsaved' : SAVE_ID, 'saving' : SAVING_TEXT, 'saved' : SAVED_TEXT, 'failed' : FAILED_TEXT}
+        cls.set_save_status(cls.__save_status)
 
     @classmethod
-    def set_savebutton_text(cls, just_saved: bool=True):
-        new_text = just_saved and cls.__SAVED_TEXT or cls.__SAVE_ID
-        save_button = GUIHandler.get_elem(cls.__SAVE_ID)
-        save_button.set_text(new_text)
+    def set_save_status(cls, status: str):
+        '''Show the status of saving the floor on the save button:
+        'unsaved', 'saving', 'saved', or 'failed'. Remembered for when the buttons are next shown.'''
+        cls.__save_status = status
+        if cls.__save_button is not None: cls.__save_button.set_text(cls.__STATUS_TEXTS[status])
 
 class ResizeMenuVisual(CentredFixedSizeGUIVisualHandler):
     _GUI_WIDTH = 175
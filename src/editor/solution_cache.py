@@ -0,0 +1,156 @@
+import yaml
+from collections import OrderedDict
+from ..file_utility import FileUtility
+from .bitboard_solver import BitboardSolver
+
+class SolutionCache:
+    '''Stores what's been worked out about floors, so toggling a cell back and forth
+    in the editor doesn't mean solving the same floor again.
+
+    Floors that are the same up to moving the start (the floor wraps round, so
+    every position is alike), rotating, or reflecting have the same solutions,
+    so they share an entry. Each entry is a dictionary that can contain
+    'possible' (whether the floor can be cleared), 'solutions' (the number of solutions),
+    and 'witness' (one solution, as a list of directions).
+
+    The least recently used entries are removed when there are too many.
+    Entries can be saved to a file in resources/cache to be reused next time.'''
+
+    __MAX_ENTRIES = 4096
+    __FILENAME = 'solutions.yaml'
+
+    # Maps canonical keys to entries, in order of use.
+    __entries = OrderedDict()
+
+    @classmethod
+    def lookup(cls, floor_obj) -> dict:
+        '''Return a copy of the entry for the floor, which is empty if nothing is known yet.
+        The witness is given in terms of the floor's own directions.'''
+        key, transform = cls.__canonical(floor_obj)
+        if key not in cls.__entries: return {}
+        cls.__entries.move_to_end(key)
+        entry = dict(cls.__entries[key])
+        if 'witness' in entry:
+            entry['witness'] = [cls.__map_direction(direc, *transform, inverse=True)
+                                for direc in entry['witness']]
+        return entry
+
+    @classmethod
+    def store(cls, floor_obj, **results):
+        '''Add the given results (possible, solutions, witness) to the entry for the floor.'''
+        key, transform = cls.__canonical(floor_obj)
+        if 'witness' in results:
+            results['witness'] = [cls.__map_direction(direc, *transform)
+                                  for direc in results['witness']]
+        entry = cls.__entries.setdefault(key, {})
+        entry.update(results)
+        cls.__entries.move_to_end(key)
+        while len(cls.__entries) > cls.__MAX_ENTRIES:
+            cls.__entries.popitem(last=False)
+
+    @classmethod
+    def load(cls):
+        '''Load entries saved by save(), if there are any.
+        Entries already in the cache take priority.'''
+        path = cls.__path()
+        try:
+            with open(path.as_posix()) as file:
+                saved = yaml.safe_load(file) or []
+        except (OSError, yaml.YAMLError) as e:
+            if path.exists(): print ('Unable to load solution cache:', e)
+            return
+
+        if not isinstance(saved, list): saved = []
+        entries = OrderedDict()
+        for item in saved:
+            # Skip anything that isn't as save() wrote it, e.g. if the file was edited by hand.
+            try:
+                key = (int(item['width']), int(item['height']), int(item['cells']))
+                entries[key] = cls.__valid_entry(item['entry'])
+            except (KeyError, TypeError, ValueError):
+                continue
+        entries.update(cls.__entries)
+        cls.__entries = entries
+        while len(cls.__entries) > cls.__MAX_ENTRIES:
+            cls.__entries.popitem(last=False)
+
+    @classmethod
+    def save(cls):
+        '''Save the entries to a file in resources/cache.'''
+        saved = [
+            {'width' : width, 'height' : height, 'cells' : cells, 'entry' : entry}
+            for (width, height, cells), entry in cls.__entries.items()
+        ]
+        path = cls.__path()
+        try:
+            path.parent.mkdir(exist_ok=True)
+            with open(path.as_posix(), 'w') as file:
+                yaml.safe_dump(saved, file)
+        except OSError as e:
+            print ('Unable to save solution cache:', e)
+
+    @staticmethod
+    def __valid_entry(entry) -> dict:
+        '''Return the entry read from the file, or raise TypeError if it isn't a valid entry.'''
+        if not isinstance(entry, dict) or not entry: raise TypeError
+        for name, value in entry.items():
+            match name:
+                case 'possible':
+                    if type(value) is not bool: raise TypeError
+                case 'solutions':
+                    if type(value) is not int or value < 0: raise TypeError
+                case 'witness':
+                    if not isinstance(value, list) or any(direc not in (1, -1, 2, -2) for direc in value):
+                        raise TypeError
+                case _:
+                    raise TypeError
+        return entry
+
+    @classmethod
+    def __path(cls):
+        return FileUtility.path_to_resource_directory('cache') / cls.__FILENAME
+
+    @staticmethod
+    def __canonical(floor_obj) -> tuple:
+        '''Return a key shared by all floors with the same solutions as this one,
+        and how the floor was transformed to get it: (flip_x, flip_y, swap).
+
+        The floor is moved so that the painter starts at 0,0, then each combination of
+        reflecting it horizontally, vertically, and along its diagonal is tried
+        (giving every rotation and reflection). The key is the smallest resulting
+        (width, height, bitmask of empty cells).'''
+        width, height, empty, start = BitboardSolver.encode(floor_obj)
+        start_x, start_y = start % width, start // width
+        cells = []
+        while empty:
+            bit = empty & -empty
+            empty ^= bit
+            index = bit.bit_length() - 1
+            cells.append(((index % width - start_x) % width, (index // width - start_y) % height))
+
+        best = None
+        for swap in (False, True):
+            new_w, new_h = swap and (height, width) or (width, height)
+            for flip_x in (False, True):
+                for flip_y in (False, True):
+                    mask = 0
+                    for x, y in cells:
+                        if flip_x: x = -x % width
+                        if flip_y: y = -y % height
+                        if swap: x, y = y, x
+                        mask |= 1 << (y * new_w + x)
+                    key = (new_w, new_h, mask)
+                    if best is None or key < best[0]:
+                        best = (key, (flip_x, flip_y, swap))
+        return best
+
+    @staticmethod
+    def __map_direction(direc: int, flip_x: bool, flip_y: bool, swap: bool, inverse: bool=False) -> int:
+        '''Return the direction a move becomes after the floor is transformed,
+        or before it was transformed if inverse is True.
+        Directions are as in DirectionUtility: 1 and -1 are horizontal, 2 and -2 vertical.'''
+        if inverse and swap: direc = abs(direc) == 1 and direc * 2 or direc // 2
+        if flip_x and abs(direc) == 1: direc = -direc
+        if flip_y and abs(direc) == 2: direc = -direc
+        if swap and not inverse: direc = abs(direc) == 1 and direc * 2 or direc // 2
+        return direc
@@ -0,0 +1,161 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from ..config import OnlineConfig
+from .floor_data import FloorData
+from .floor_auto_player import FloorAutoPlayer
+from .solution_cache import SolutionCache
+
+# In a worker process, the generation number of the latest job submitted, shared with the editor.
+_latest_generation = None
+
+def _init_worker(latest_generation):
+    '''Store the shared generation number. Called when a worker process starts.'''
+    global _latest_generation
+    _latest_generation = latest_generation
+
+def _floor_from_job(job: tuple):
+    '''Return a FloorData object for the floor described in a job.'''
+    kind, width, height, full_cells, start = job
+    floor_obj = FloorData(width, height)
+    for pos in full_cells:
+        floor_obj.get_cell_grid()[pos].start_filled()
+    floor_obj.set_initial_painter_position(start)
+    return floor_obj
+
+def _solve(job: tuple, generation: int=None):
+    '''Run a job in a worker process, and return its result,
+    along with the floor's SolutionCache entry so it can be copied to the editor's cache.
+    A job is a tuple of plain data, so it can be sent to another process
+    without sending the FloorData object being edited: the kind of job
+    ('possible' or 'count'), the floor's width and height,
+    the positions of its full cells, and the painter's starting position.
+    The result is None if the solver gave up, which it does as soon as it notices
+    a newer job has been submitted, if the job's generation number is given.'''
+    floor_obj = _floor_from_job(job)
+    should_stop = None
+    if generation is not None and _latest_generation is not None:
+        should_stop = lambda: _latest_generation.value != generation
+    try:
+        if job[0] == 'count': result = FloorAutoPlayer.num_solutions(floor_obj, should_stop)
+        else: result = FloorAutoPlayer.is_possible(floor_obj, should_stop)
+    except ValueError:
+        result = None
+    return result, SolutionCache.lookup(floor_obj)
+
+class SolverWorker:
+    '''Runs FloorAutoPlayer in worker processes, so a slow floor doesn't freeze the editor.
+    Only the latest job matters: every job submitted is given a new generation number,
+    a job still waiting to run is cancelled when a newer one is submitted,
+    and results from older generations are ignored.
+    The latest generation number is shared with the worker processes,
+    so a job that's already running stops soon after a newer one is submitted.
+    In the web version, where processes aren't available, jobs are run straight away instead.'''
+
+    __MAX_WORKERS = 2
+
+    __pool = None
+    # Set to False if worker processes can't be started.
+    __can_use_processes = True
+    __generation = 0
+    # Shared with the worker processes: see _init_worker().
+    __latest_generation = None
+    __future = None
+    __job = None
+    # Result of a job run straight away, and its generation.
+    __sync_result = None
+
+    @classmethod
+    def submit(cls, kind: str, floor_obj) -> int:
+        '''Start solving the floor in the background, and return the job's generation number.
+        kind is 'possible' to check whether the floor can be cleared,
+        or 'count' to count its solutions.'''
+        cls.__new_generation()
+        grid = floor_obj.get_cell_grid()
+        width, height = grid.get_size()
+        job = (kind, width, height, tuple(grid.get_full_cell_positions()),
+               floor_obj.get_initial_painter_position())
+
+        if cls.__future is not None: cls.__future.cancel()
+        cls.__future = None
+
+        # Don't bother the worker processes if the result is already known.
+        cached = SolutionCache.lookup(floor_obj).get(kind == 'count' and 'solutions' or 'possible')
+        if cached is not None:
+            cls.__sync_result = (cls.__generation, cached)
+            return cls.__generation
+
+        pool = cls.__get_pool()
+        if pool is not None:
+            try:
+                cls.__future = pool.submit(_solve, job, cls.__generation)
+                cls.__job = job
+                return cls.__generation
+            except RuntimeError as e:
+                # The pool is broken, e.g. a worker process was killed.
+                print ('Unable to use solver worker processes, solving in the editor instead:', e)
+                cls.__can_use_processes = False
+        cls.__sync_result = (cls.__generation, _solve(job)[0])
+        return cls.__generation
+
+    @classmethod
+    def poll(cls) -> tuple | None:
+        '''Return (generation, result) once for the latest job when it finishes,
+        and None while it's still running or if there's no job.
+        The result is None if the solver gave up.'''
+        if cls.__sync_result is not None:
+            output = cls.__sync_result
+            cls.__sync_result = None
+            return output
+
+        future = cls.__future
+        if future is None or not future.done(): return None
+        cls.__future = None
+        if future.cancelled(): return None
+        try:
+            result, entry = future.result()
+            # Copy what the worker process worked out into this process's cache.
+            if entry: SolutionCache.store(_floor_from_job(cls.__job), **entry)
+            return cls.__generation, result
+        except Exception as e:
+            # e.g. if a worker process crashed. Treat it like the solver giving up.
+            print ('Solver worker failed:', e)
+            return cls.__generation, None
+
+    @classmethod
+    def cancel(cls):
+        '''Forget about the latest job, and stop it.'''
+        cls.__new_generation()
+        if cls.__future is not None: cls.__future.cancel()
+        cls.__future = None
+        cls.__sync_result = None
+
+    @classmethod
+    def shutdown(cls):
+        '''Stop the worker processes, without waiting for a running job.'''
+        cls.cancel()
+        if cls.__pool is not None:
+            cls.__pool.shutdown(wait=False, cancel_futures=True)
+            cls.__pool = None
+            cls.__latest_generation = None
+
+    @classmethod
+    def __new_generation(cls):
+        '''Move on to a new generation number, telling the worker processes to stop older jobs.'''
+        cls.__generation += 1
+        if cls.__latest_generation is not None: cls.__latest_generation.value = cls.__generation
+
+    @classmethod
+    def __get_pool(cls):
+        '''Return the pool of worker processes, starting it on first use.
+        Return None if jobs should be run straight away.'''
+        if OnlineConfig.is_online() or not cls.__can_use_processes: return None
+        if cls.__pool is None:
+            try:
+                cls.__latest_generation = multiprocessing.Value('q', cls.__generation, lock=False)
+                cls.__pool = ProcessPoolExecutor(max_workers=cls.__MAX_WORKERS, initializer=_init_worker,
+                                                 initargs=(cls.__latest_generation,))
+            except (OSError, NotImplementedError, ImportError) as e:
+                print ('Unable to start solver worker processes, solving in the editor instead:', e)
+                cls.__can_use_processes = False
+                return None
+        return cls.__pool
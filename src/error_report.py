@@ -12,10 +12,19 @@ class ErrorReportVisual(TextDisplayVisualHandler):
         cls._text = message + cls.__CONTROL_PROMPT_ENDING
 
     @classmethod
-    def set_message_from_invalid_packs(cls, invalid_pack_names: list[str]):
-        START = 'Some level packs are invalid:\n'
-        END = '\nAny valid level packs will still work.'
-        cls.set_message(START + '\n'.join(invalid_pack_names) + END)
+    def set_message_from_invalid_packs(cls, invalid_pack_names: list[str], stale_journal_names: list[str]=()):
+        '''Also lists journals with unsaved changes to level packs whose files have changed since,
+        which have been set aside in resources/floors/journal (see FloorpackJournal).'''
+        messages = []
+        if invalid_pack_names:
+            START = 'Some level packs are invalid:\n'
+            END = '\nAny valid level packs will still work.'
+            messages.append(START + '\n'.join(invalid_pack_names) + END)
+        if stale_journal_names:
+            START = 'Some level packs have changed since changes\nto them were saved, so those weren\'t applied.\n' \
+                'They have been kept in resources/floors/journal as:\n'
+            messages.append(START + '\n'.join(stale_journal_names))
+        cls.set_message('\n'.join(messages))
 
 class ErrorReportControl(InputHandler):
     # By default, close the game after dismissing the error report
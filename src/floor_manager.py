@@ -1,15 +1,31 @@
-import yaml
-from copy import deepcopy
-from os import walk
+from .config import OnlineConfig
 from .file_utility import FileUtility
 from .error_report import ErrorReportVisual
-from .editor.floor_data import FloorData
+from .floorpack_format import FloorpackFormat
+from .binary_floorpack import BinaryFloorpack
+from .floorpack_manifest import FloorpackManifest
+from .compiled_pack_cache import CompiledPackCache
+from .floorpack_journal import FloorpackJournal
+
+def _index_floorpack(path):
+    '''Load the floorpack at the given path, and return its ID and number of floors.
+    If the file doesn't contain a floorpack, raise TypeError.
+    Called by FloorpackManifest for new or changed files, maybe in a worker process:
+    YAML floorpacks are added to CompiledPackCache as they're loaded,
+    so loading them again in the main process is quick.'''
+    try: floorpack_id = FloorManager.get_packname(path.name)
+    except ValueError: raise TypeError
+    FloorManager._load_floorpack(path, path.name)
+    return floorpack_id, len(FloorManager._floor_packs[floorpack_id])
 
 class FloorManager:
     '''Class responsible for creating and storing floor data.'''
 
     # Data for floors (levels)
     _floor_packs = {}
+    # Floorpack IDs to the paths of their files.
+    # They're only read into _floor_packs when selected.
+    __pack_paths = {}
     # String ID of the current list of floors
     _current_pack_id = ''
     # Index of the floor to play next
@@ -17,33 +33,74 @@ class FloorManager:
 
     @classmethod
     def load_floors(cls):
-        '''Iterate through the yaml files in the resources/floors directory,
-        deserialising a list of FloorData objects from each.
-        These 'floorpacks' will be stored so they can be played later.
-        
+        '''Find the floorpack files in the resources/floors directory, using FloorpackManifest,
+        so they can be played later. A floorpack is only read from its file
+        (a list of FloorData objects) when it's selected, unless it's new or has changed,
+        in which case it's read now to check it. If many are new or have changed,
+        they're read in worker processes at the same time.
+
         If any floorpacks are invalid, call ErrorReportVisual.set_message_from_invalid_packs()
         to prepare an error message with the names of the invalid packs, and raise TypeError.
-        Valid floorpacks will still be loaded.'''
+        Valid floorpacks will still be loaded.
+        The same is done if any floorpacks have journals that can't be applied
+        because the file has changed since (see FloorpackJournal): they're set aside.'''
         invalid_floorpack_names = []
+        stale_journal_names = []
+
+        # Forget floorpacks read from files before, in case the files have changed.
+        for floorpack_id in cls.__pack_paths:
+            cls._floor_packs.pop(floorpack_id, None)
+        cls.__pack_paths.clear()
 
         floorpack_dir = FileUtility.path_to_resource_directory('floors')
-        # Iterate over files in the directory
-        # (this will also load floorpack files in subdirectories,
-        # though this is not used)
-        for rootpath, _, filenames in walk(floorpack_dir):
-
-            for fname in filenames:
-                # Join directory and fname to find the path.
-                path = (floorpack_dir / fname)
-                # Load floorpack file
-                try:
-                    cls._load_floorpack(path, fname)
-                except TypeError:
-                    invalid_floorpack_names.append(fname)
-        if len(invalid_floorpack_names) > 0:
-            ErrorReportVisual.set_message_from_invalid_packs(invalid_floorpack_names)
+        parallel = not OnlineConfig.is_online()
+        for entry in FloorpackManifest.refresh(floorpack_dir, _index_floorpack, parallel):
+            if entry['valid']:
+                path = floorpack_dir / entry['file']
+                cls.__pack_paths[entry['name']] = path
+                if FloorpackJournal.is_stale(path, entry['hash']):
+                    new_path = FloorpackJournal.set_aside(path)
+                    stale_journal_names.append(new_path is None and entry['file'] or new_path.name)
+            elif 'duplicate_of' in entry:
+                invalid_floorpack_names.append(f"{entry['file']} (same name as {entry['duplicate_of']})")
+                # It may have been read over the other file's floors when it was indexed.
+                cls._floor_packs.pop(entry['name'], None)
+            else:
+                invalid_floorpack_names.append(entry['file'])
+        if len(invalid_floorpack_names) > 0 or len(stale_journal_names) > 0:
+            ErrorReportVisual.set_message_from_invalid_packs(invalid_floorpack_names, stale_journal_names)
             raise TypeError
+
+    @classmethod
+    def _get_floorpack(cls, floorpack_id: str):
+        '''Return the floorpack with the given ID,
+        reading it from its file first if that hasn't been done yet.
+        If the file is no longer a valid floorpack (e.g. it's been deleted since load_floors()),
+        forget it, call ErrorReportVisual.set_message_from_invalid_packs(), and raise TypeError.'''
+        if floorpack_id not in cls._floor_packs:
+            path = cls.__pack_paths[floorpack_id]
+            try: cls._load_floorpack(path, floorpack_id=floorpack_id)
+            except TypeError:
+                cls._forget_invalid_floorpack(floorpack_id)
+                raise
+        return cls._floor_packs[floorpack_id]
+
+    @classmethod
+    def _forget_invalid_floorpack(cls, floorpack_id: str):
+        '''Take the floorpack with the given ID out of the menus, as it's been found to be invalid,
+        and call ErrorReportVisual.set_message_from_invalid_packs() with its file name.
+        If it has a file, that's checked again by FloorpackManifest next time.'''
+        cls._floor_packs.pop(floorpack_id, None)
+        path = cls.__pack_paths.pop(floorpack_id, None)
+        if path is not None: FloorpackManifest.forget(path.name)
+        ErrorReportVisual.set_message_from_invalid_packs([path is None and floorpack_id or path.name])
     
+    @classmethod
+    def _get_floorpack_path(cls, floorpack_id: str):
+        '''Return the path of the file the floorpack with the given ID is read from,
+        or None if it wasn't found by load_floors() (e.g. it was created or uploaded since).'''
+        return cls.__pack_paths.get(floorpack_id)
+
     @classmethod
     def _load_floorpack(cls, path, fname: str=None, floorpack_id: str=None):
         '''Load the floorpack at the given pathlib.Path into memory.
@@ -54,6 +111,10 @@ class FloorManager:
         (This is significant because when uploading, the path is different to the original filename)
 
         If the file doesn't contain a floorpack, raise TypeError.
+        The file is read as plain data (see FloorpackFormat), so an uploaded file can't run code.
+        Files with BinaryFloorpack.EXTENSION are binary floorpacks, whose floors are only read when needed.
+        YAML files are only parsed if CompiledPackCache doesn't have a binary copy of them already.
+        Changes saved to the floorpack's FloorpackJournal since the file was last written are applied.
         
         Called in load_floors() and EditorFloorManager.upload_floorpack().'''
 
@@ -63,14 +124,18 @@ class FloorManager:
         posix_path = path.as_posix()
 
         try:
-            with open(posix_path) as file:
-                floorpack = yaml.load(file, Loader=yaml.Loader)
+            if (fname or path.name).endswith(BinaryFloorpack.EXTENSION):
+                floorpack = BinaryFloorpack(path)
+            else:
+                with open(posix_path, 'rb') as file:
+                    content = file.read()
+                floorpack = CompiledPackCache.load(content)
+                if floorpack is None:
+                    floorpack = FloorpackFormat.load(content.decode('utf-8'))
+                    CompiledPackCache.store(content, floorpack)
+            floorpack = FloorpackJournal.replay(path, floorpack)
         except Exception:
             raise TypeError
-
-        # Check the pack is a list of FloorData
-        if not isinstance(floorpack, list) or not all([isinstance(floor, FloorData) for floor in floorpack]):
-            raise TypeError
         
         if floorpack_id is None:
             if fname is None: floorpack_id = path.name
@@ -94,31 +159,43 @@ class FloorManager:
     def next_floor(cls):
         '''Return the next floor in the floorpack.
         Called after completing a floor.
-        Assumes the floorpack is not over.'''
+        Assumes the floorpack is not over.
+        Only this floor is read from the pack, if it's a BinaryFloorpack:
+        if it turns out to be invalid, the pack is forgotten and TypeError is raised,
+        as in _get_floorpack().'''
         
         # Get next floor
         floorpack = cls._floor_packs[cls._current_pack_id]
         print (f'Moving onto {cls.__next_floor_index + 1} of {len(floorpack)}')
-        floor = floorpack[cls.__next_floor_index]
+        try: floor = floorpack[cls.__next_floor_index]
+        except TypeError:
+            cls._forget_invalid_floorpack(cls._current_pack_id)
+            raise
         
         # Increment progression index
         cls.__next_floor_index += 1
-        return deepcopy(floor)
+        return floor.clone()
     
     @classmethod
     def get_floorpack_names(cls):
         '''Return a list of the names of floorpacks.
-        They can then be options in floorpack selection.'''
-        return [name for name in cls._floor_packs.keys()]
+        They can then be options in floorpack selection.
+        This includes floorpacks that haven't been read from their files yet.'''
+        names = list(cls.__pack_paths.keys())
+        names += [name for name in cls._floor_packs.keys() if name not in cls.__pack_paths]
+        return names
     
     @classmethod
     def get_num_floorpacks(cls):
         '''Return the number of floorpacks.'''
-        return len(cls._floor_packs)
+        return len(cls.get_floorpack_names())
     
     @classmethod
     def select_floorpack(cls, pack_name: str):
-        '''Floors will be chosen from the floorpack with this name.'''
+        '''Floors will be chosen from the floorpack with this name.
+        It's read from its file if that hasn't been done yet.
+        Raises TypeError if it can't be: see _get_floorpack().'''
+        cls._get_floorpack(pack_name)
         cls._current_pack_id = pack_name
     
     @classmethod
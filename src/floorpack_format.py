@@ -0,0 +1,143 @@
+import yaml
+from .editor.floor_data import FloorData
+
+# Use LibYAML if it's installed, as it's much faster.
+_SafeLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_SafeDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+class _LegacyLoader(_SafeLoader):
+    '''Loads floorpack files from before version 2, which were written by
+    dumping the FloorData objects directly, with !!python/object tags.
+    Only the tags for FloorData and the classes in it are understood,
+    and they're turned into FloorData without running any other code,
+    so this is as safe as loading plain data.'''
+
+_OBJECT_TAG = 'tag:yaml.org,2002:python/object:src.editor.floor_data.'
+
+def _construct_tuple(loader: _LegacyLoader, node):
+    return tuple(loader.construct_sequence(node))
+
+def _construct_cell(loader: _LegacyLoader, node):
+    '''Return whether the cell is full.'''
+    return loader.construct_mapping(node).get('_Cell__filled') is True
+
+def _construct_grid(loader: _LegacyLoader, node):
+    '''Return the size of the grid and a list of positions of full cells.'''
+    state = loader.construct_mapping(node, deep=True)
+    cells = state.get('_CellGrid__cells') or {}
+    if not isinstance(cells, dict): raise TypeError
+    full_cells = [pos for pos, full in cells.items() if full]
+    return [state.get('_CellGrid__w'), state.get('_CellGrid__h')], full_cells
+
+def _construct_floor(loader: _LegacyLoader, node):
+    state = loader.construct_mapping(node, deep=True)
+    try: size, full_cells = state['_FloorData__grid']
+    except (KeyError, TypeError, ValueError): raise TypeError
+    return FloorpackFormat.floor_from_data({
+        'size' : size,
+        'start' : state.get('_FloorData__initial_painter_position'),
+        'filled' : full_cells,
+    })
+
+_LegacyLoader.add_constructor('tag:yaml.org,2002:python/tuple', _construct_tuple)
+_LegacyLoader.add_constructor(_OBJECT_TAG + 'Cell', _construct_cell)
+_LegacyLoader.add_constructor(_OBJECT_TAG + 'CellGrid', _construct_grid)
+_LegacyLoader.add_constructor(_OBJECT_TAG + 'FloorData', _construct_floor)
+
+
+class FloorpackFormat:
+    '''Converts floorpacks (lists of FloorData) to and from floorpack files.
+
+    Files are plain YAML data, so loading them can't run code, e.g. from an uploaded file:
+
+        version: 2
+        floors:
+        - size: [4, 3]      (width, height)
+          start: [1, 1]     (the painter's initial position)
+          filled: [[2, 1], [0, 2]]  (positions of cells that start filled)
+
+    Files from before version 2, with a list of !!python/object:...FloorData,
+    can still be loaded. Saving one again converts it to the current version.'''
+
+    VERSION = 2
+
+    @classmethod
+    def load(cls, stream) -> list:
+        '''Return the list of FloorData in the given floorpack file or string.
+        If it isn't a valid floorpack, raise TypeError.'''
+        if not isinstance(stream, str): stream = stream.read()
+        try:
+            data = yaml.load(stream, Loader=_SafeLoader)
+        except yaml.constructor.ConstructorError:
+            # Python objects: from before version 2.
+            return cls.__load_legacy(stream)
+        except yaml.YAMLError:
+            raise TypeError
+        return cls.from_data(data)
+
+    @classmethod
+    def dump(cls, floorpack: list, stream=None):
+        '''Write the floorpack to the given file in the current version.
+        If no file is given, return it as a string.'''
+        return yaml.dump(cls.to_data(floorpack), stream, Dumper=_SafeDumper,
+                         default_flow_style=None, sort_keys=False)
+
+    @classmethod
+    def to_data(cls, floorpack: list) -> dict:
+        '''Return the plain data to save for the floorpack.'''
+        floors = [cls.floor_to_data(floor) for floor in floorpack]
+        return {'version' : cls.VERSION, 'floors' : floors}
+
+    @staticmethod
+    def floor_to_data(floor: FloorData) -> dict:
+        '''Return the plain data for one floor, the reverse of floor_from_data().'''
+        grid = floor.get_cell_grid()
+        return {
+            'size' : list(grid.get_size()),
+            'start' : list(floor.get_initial_painter_position()),
+            'filled' : [list(pos) for pos in grid.get_full_cell_positions()],
+        }
+
+    @classmethod
+    def from_data(cls, data) -> list:
+        '''Return the list of FloorData described by the plain data from a floorpack file.
+        If it isn't a valid floorpack, raise TypeError.'''
+        if not isinstance(data, dict) or data.get('version') != cls.VERSION: raise TypeError
+        floors = data.get('floors')
+        if not isinstance(floors, list): raise TypeError
+        return [cls.floor_from_data(floor) for floor in floors]
+
+    @classmethod
+    def floor_from_data(cls, data) -> FloorData:
+        '''Return a FloorData for one floor's data: a dictionary with its
+        size, start, and filled cells. If the data isn't valid, raise TypeError.'''
+        try:
+            width, height = cls.__pair_of_ints(data['size'])
+            if not FloorData.is_valid_size(width, height): raise TypeError
+            start = cls.__pair_of_ints(data['start'])
+
+            floor = FloorData(width, height)
+            grid = floor.get_cell_grid()
+            for pos in data.get('filled') or []:
+                grid[cls.__pair_of_ints(pos)].start_filled()
+            floor.set_initial_painter_position(start)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            raise TypeError
+        return floor
+
+    @staticmethod
+    def __pair_of_ints(value) -> tuple[int]:
+        '''Return the value as a tuple of two integers, or raise TypeError if it isn't one.'''
+        x, y = value
+        if type(x) is not int or type(y) is not int: raise TypeError
+        return (x, y)
+
+    @staticmethod
+    def __load_legacy(stream: str) -> list:
+        try:
+            floorpack = yaml.load(stream, Loader=_LegacyLoader)
+        except (yaml.YAMLError, TypeError):
+            raise TypeError
+        if not isinstance(floorpack, list) or not all(isinstance(floor, FloorData) for floor in floorpack):
+            raise TypeError
+        return floorpack
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+from .floorpack_format import FloorpackFormat
+from .binary_floorpack import BinaryFloorpack
+
+class FloorpackJournal:
+    '''Saves changes to a floorpack by adding small records to a journal file,
+    rather than writing out the whole floorpack every time.
+    When the journal gets long, the whole floorpack is written instead (compacted),
+    to a temporary file which then replaces the floorpack file in one step,
+    so the file is never left half-written.
+
+    Journals are in a 'journal' directory beside the floorpack files, one line of JSON per record.
+    The first line has a hash of the floorpack file the records apply to,
+    so a journal left over from before the file was replaced (e.g. by git) isn't applied to it.
+    Those journals are set aside rather than deleted, and FloorManager reports them.
+    Records:
+        {"op": "set", "index": i, "floor": floor data}  (a floor was edited)
+        {"op": "insert", "index": i, "floor": floor data}  (a floor was created)
+        {"op": "delete", "index": i}
+        {"op": "move", "from": i, "to": j}
+    Floor data is as in FloorpackFormat.floor_to_data().'''
+
+    __DIRNAME = 'journal'
+    # Compact instead of adding to a journal bigger than this.
+    __MAX_BYTES = 65536
+
+    @classmethod
+    def replay(cls, pack_path, floorpack):
+        '''Return the floorpack loaded from the file at the given pathlib.Path,
+        with the changes in its journal applied, if there is one.
+        A record that can't be read (e.g. it was cut off part way through being written)
+        and anything after it is ignored.
+        A journal for a different version of the file (e.g. the file was replaced by git)
+        isn't applied, but it's kept: see is_stale() and set_aside().'''
+        path = cls.__journal_path(pack_path)
+        try:
+            with open(path.as_posix(), 'rb') as file:
+                lines = file.read().splitlines()
+        except OSError:
+            return floorpack
+
+        if cls.__base_of(lines) != cls.__hash_of(pack_path):
+            print (f'Not applying the journal for {pack_path.name}, as the file has changed since')
+            return floorpack
+
+        floors = list(floorpack)
+        if isinstance(floorpack, BinaryFloorpack): floorpack.close()
+        for line in lines[1:]:
+            try: cls.__apply(floors, json.loads(line))
+            except (ValueError, KeyError, IndexError, TypeError, AttributeError):
+                print (f'Ignoring unreadable changes in the journal for {pack_path.name}')
+                break
+        return floors
+
+    @classmethod
+    def has_changes(cls, pack_path) -> bool:
+        '''Return whether the journal for the floorpack file at the given pathlib.Path
+        has any records, i.e. whether the file is missing changes.'''
+        try:
+            with open(cls.__journal_path(pack_path).as_posix(), 'rb') as file:
+                return len(file.read().splitlines()) > 1
+        except OSError:
+            return False
+
+    @classmethod
+    def is_stale(cls, pack_path, pack_hash: str=None) -> bool:
+        '''Return whether there's a journal for the floorpack file at the given pathlib.Path
+        whose records were made to a different version of the file, so they can't be applied.
+        The sha256 hash of the file can be given if it's already known (e.g. from FloorpackManifest).'''
+        try:
+            with open(cls.__journal_path(pack_path).as_posix(), 'rb') as file:
+                header = file.readline()
+        except OSError:
+            return False
+        if pack_hash is None: pack_hash = cls.__hash_of(pack_path)
+        return cls.__base_of([header]) != pack_hash
+
+    @classmethod
+    def set_aside(cls, pack_path):
+        '''Rename the journal for the floorpack file at the given pathlib.Path,
+        so it's kept (its changes can be copied across by hand) but isn't used any more.
+        Return the new path, or None if it couldn't be renamed.'''
+        path = cls.__journal_path(pack_path)
+        number = 1
+        while (new_path := path.with_name(f'{path.name}.{number}.stale')).exists():
+            number += 1
+        try: os.replace(path.as_posix(), new_path.as_posix())
+        except OSError as e:
+            print ('Unable to set aside floorpack journal:', e)
+            return None
+        return new_path
+
+    @classmethod
+    def append(cls, pack_path, records: list[dict]) -> bool:
+        '''Add the records to the journal for the floorpack file at the given pathlib.Path.
+        Return False without adding them if the floorpack should be compacted instead,
+        because the journal is too big or its last record is incomplete.'''
+        path = cls.__journal_path(pack_path)
+        lines = [json.dumps(record, separators=(',', ':')) for record in records]
+        try:
+            if path.exists():
+                if path.stat().st_size > cls.__MAX_BYTES: return False
+                if cls.is_stale(pack_path): return False
+                with open(path.as_posix(), 'rb') as file:
+                    file.seek(-1, os.SEEK_END)
+                    if file.read(1) != b'\n': return False
+            else:
+                path.parent.mkdir(exist_ok=True)
+                lines.insert(0, json.dumps({'base' : cls.__hash_of(pack_path)}))
+
+            with open(path.as_posix(), 'a') as file:
+                file.write(''.join(line + '\n' for line in lines))
+                file.flush()
+                os.fsync(file.fileno())
+        except OSError as e:
+            print ('Unable to add to floorpack journal:', e)
+            return False
+        return True
+
+    @classmethod
+    def compact(cls, pack_path, write):
+        '''Replace the floorpack file at the given pathlib.Path in one step,
+        by calling write(temp_path) to write the whole floorpack to a temporary file first.
+        Then start a new, empty journal for it: the old one is now included in the file,
+        unless it was for a different version of the file, in which case it's set aside.'''
+        journal_path = cls.__journal_path(pack_path)
+        if cls.is_stale(pack_path): cls.set_aside(pack_path)
+        journal_path.parent.mkdir(exist_ok=True)
+        temp_path = journal_path.with_suffix('.tmp')
+        write(temp_path)
+        base_hash = cls.__hash_of(temp_path)
+        with open(temp_path.as_posix(), 'rb+') as file:
+            os.fsync(file.fileno())
+        os.replace(temp_path.as_posix(), pack_path.as_posix())
+
+        # If this doesn't happen, the old journal will be ignored, as its hash won't match.
+        with open(temp_path.as_posix(), 'w') as file:
+            file.write(json.dumps({'base' : base_hash}) + '\n')
+        os.replace(temp_path.as_posix(), journal_path.as_posix())
+
+    @staticmethod
+    def __apply(floors: list, record: dict):
+        match record['op']:
+            case 'set':
+                floors[record['index']] = FloorpackFormat.floor_from_data(record['floor'])
+            case 'insert':
+                floors.insert(record['index'], FloorpackFormat.floor_from_data(record['floor']))
+            case 'delete':
+                del floors[record['index']]
+            case 'move':
+                floors.insert(record['to'], floors.pop(record['from']))
+            case _:
+                raise ValueError
+
+    @staticmethod
+    def __base_of(lines: list) -> str | None:
+        '''Return the hash in the first line of a journal, or None if it can't be read.'''
+        try: return json.loads(lines[0])['base']
+        except (IndexError, KeyError, TypeError, ValueError): return None
+
+    @classmethod
+    def __journal_path(cls, pack_path):
+        return pack_path.parent / cls.__DIRNAME / (pack_path.name + '.journal')
+
+    @staticmethod
+    def __hash_of(path) -> str | None:
+        try:
+            with open(path.as_posix(), 'rb') as file:
+                return hashlib.sha256(file.read()).hexdigest()
+        except OSError:
+            return None
@@ -0,0 +1,155 @@
+import hashlib
+import os
+import yaml
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .file_utility import FileUtility
+
+class FloorpackManifest:
+    '''An index of the floorpack files in resources/floors, so the floorpack menu
+    can be shown without reading every floorpack.
+
+    For each file, it records the floorpack's name, number of floors,
+    modification time, size, content hash, and whether it's a valid floorpack.
+    It's saved in resources/cache, and on startup only files that have been
+    added or changed since then are read again, in parallel if there are many.'''
+
+    __FILENAME = 'manifest.yaml'
+    __VERSION = 1
+    # Fewer new or changed files than this are indexed in this process,
+    # as starting worker processes takes longer.
+    __MIN_FILES_FOR_PROCESSES = 4
+
+    # Maps filenames to entries.
+    __entries = None
+
+    @classmethod
+    def refresh(cls, floorpack_dir, index_pack, parallel: bool=False) -> list[dict]:
+        '''Bring the manifest up to date with the files in the given directory,
+        and return the entries, in order of filename.
+
+        A valid file with the same floorpack name as a file before it (e.g. pack.yaml after pack.pack)
+        is returned as invalid, with 'duplicate_of' set to the name of that file.
+
+        index_pack(path) is called for files that are new or whose contents have changed.
+        It should return the floorpack's name and number of floors,
+        or raise TypeError if the file isn't a floorpack.
+        If parallel is True and there are enough of those files, they're indexed
+        in worker processes, in which case index_pack must be a module-level function.'''
+        if cls.__entries is None: cls.__entries = cls.__load()
+
+        entries = {}
+        # Paths of files to index, to their stat results and hashes.
+        to_index = {}
+        for path in sorted(floorpack_dir.iterdir()):
+            if not path.is_file(): continue
+            stat = path.stat()
+            entry = cls.__entries.get(path.name)
+            if entry is not None and entry['mtime'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+                entries[path.name] = entry
+                continue
+
+            with open(path.as_posix(), 'rb') as file:
+                content_hash = hashlib.sha256(file.read()).hexdigest()
+            if entry is not None and entry['hash'] == content_hash:
+                # Only the modification time changed.
+                entries[path.name] = dict(entry, mtime=stat.st_mtime_ns, size=stat.st_size)
+            else:
+                to_index[path] = (stat, content_hash)
+                # Keep the files in order: replaced once indexed.
+                entries[path.name] = None
+
+        use_processes = parallel and len(to_index) >= cls.__MIN_FILES_FOR_PROCESSES \
+            and (os.cpu_count() or 1) > 1
+        if use_processes: results = cls.__index_in_processes(list(to_index), index_pack)
+        else: results = ((path, cls.__try_index(path, index_pack)) for path in to_index)
+        for path, result in results:
+            stat, content_hash = to_index[path]
+            if result is None: entry = {'name' : path.name, 'floors' : 0, 'valid' : False}
+            else: entry = {'name' : result[0], 'floors' : result[1], 'valid' : True}
+            entry.update(hash=content_hash, file=path.name, mtime=stat.st_mtime_ns, size=stat.st_size)
+            entries[path.name] = entry
+
+        changed = entries != cls.__entries
+        cls.__entries = entries
+        if changed: cls.__save()
+
+        # Only one file can have each floorpack name, so report any others, rather than picking one.
+        results = []
+        # Floorpack names to the files that have them.
+        files_for_names = {}
+        for entry in entries.values():
+            if entry['valid'] and entry['name'] in files_for_names:
+                entry = dict(entry, valid=False, duplicate_of=files_for_names[entry['name']])
+            elif entry['valid']:
+                files_for_names[entry['name']] = entry['file']
+            results.append(entry)
+        return results
+
+    @classmethod
+    def forget(cls, filename: str):
+        '''Remove the entry for the file with the given name, so it's read again by the next refresh().
+        Called if the file turns out not to be a valid floorpack after all.'''
+        if cls.__entries is None or cls.__entries.pop(filename, None) is None: return
+        cls.__save()
+
+    @staticmethod
+    def __try_index(path, index_pack) -> tuple | None:
+        '''Return the result of index_pack(path), or None if the file isn't a floorpack.'''
+        try: return index_pack(path)
+        except TypeError: return None
+
+    @classmethod
+    def __index_in_processes(cls, paths: list, index_pack):
+        '''Yield each path with the result of index_pack(path) from a worker process,
+        or None if the file isn't a floorpack, in the order they finish.
+        If worker processes can't be used, index the files in this process instead.'''
+        try: pool = ProcessPoolExecutor()
+        except (OSError, NotImplementedError, ImportError) as e:
+            print ('Unable to start worker processes, loading floorpacks one by one:', e)
+            for path in paths: yield path, cls.__try_index(path, index_pack)
+            return
+
+        with pool:
+            futures = {pool.submit(index_pack, path) : path for path in paths}
+            for future in as_completed(futures):
+                path = futures[future]
+                try: result = future.result()
+                except TypeError: result = None
+                except Exception:
+                    # The worker process failed (rather than the file being invalid).
+                    result = cls.__try_index(path, index_pack)
+                yield path, result
+
+    @classmethod
+    def __path(cls):
+        return FileUtility.path_to_resource_directory('cache') / cls.__FILENAME
+
+    @classmethod
+    def __load(cls) -> dict:
+        '''Return the entries saved by __save(), or an empty dictionary if there aren't any.'''
+        path = cls.__path()
+        try:
+            with open(path.as_posix()) as file:
+                saved = yaml.safe_load(file)
+        except (OSError, yaml.YAMLError):
+            return {}
+
+        KEYS = {'file', 'name', 'floors', 'valid', 'hash', 'mtime', 'size'}
+        if not isinstance(saved, dict) or saved.get('version') != cls.__VERSION: return {}
+        entries = saved.get('entries')
+        if not isinstance(entries, list): return {}
+        return {
+            entry['file'] : entry for entry in entries
+            if isinstance(entry, dict) and entry.keys() == KEYS
+        }
+
+    @classmethod
+    def __save(cls):
+        path = cls.__path()
+        saved = {'version' : cls.__VERSION, 'entries' : list(cls.__entries.values())}
+        try:
+            path.parent.mkdir(exist_ok=True)
+            with open(path.as_posix(), 'w') as file:
+                yaml.safe_dump(saved, file, sort_keys=False)
+        except OSError as e:
+            print ('Unable to save floorpack manifest:', e)
@@ -1,6 +1,9 @@
 import pygame as pg
+from collections import OrderedDict
 from .file_utility import FileUtility
 class FontManager:
+    '''Loads the fonts, and renders text with them,
+    keeping the most recently rendered text surfaces so the same text isn't rendered every frame.'''
     # Font data
     __FONT_DIRNAME = 'font'
     __FONT_FILENAME = 'Gorilla_Black'
@@ -11,10 +14,29 @@ class FontManager:
     __FONT = pg.font.Font(__FONT_PATH, 17)
     __HEADING_FONT = pg.font.Font(__FONT_PATH, 20)
 
+    # Maps (font, text, colour, antialias) to text surfaces, least recently used first.
+    __rendered = OrderedDict()
+    __MAX_RENDERED = 256
+
     @classmethod
     def get_font(cls):
         return cls.__FONT
     
     @classmethod
     def get_heading_font(cls):
-        return cls.__HEADING_FONT
\ No newline at end of file
+        return cls.__HEADING_FONT
+
+    @classmethod
+    def render(cls, font, text: str, colour, antialias: bool=True):
+        '''Return a surface with the text rendered in the given font, like font.render().
+        The same surface is returned for the same arguments, so it mustn't be drawn on.'''
+        key = (font, text, tuple(colour), antialias)
+        surf = cls.__rendered.get(key)
+        if surf is not None:
+            cls.__rendered.move_to_end(key)
+            return surf
+
+        surf = font.render(text, antialias, colour)
+        cls.__rendered[key] = surf
+        if len(cls.__rendered) > cls.__MAX_RENDERED: cls.__rendered.popitem(last=False)
+        return surf
@@ -0,0 +1,53 @@
+from ..abstract_handlers import VisualHandler
+from .floor_visual import FloorVisual
+from .floor_player import FloorPlayer
+from .hint_engine import HintEngine
+import pygame as pg
+
+class DeadEndVisual(VisualHandler):
+    '''Outlines the painter's cell when the floor can no longer be cleared without undoing.'''
+    __COL = pg.Color(255, 200, 0)
+    __LINE_SIZE = 4
+    # The outline is worked out in prepare_frame(), and marked as damaged when it changes.
+    _TRACKS_DAMAGE = True
+    # Give up checking a position after this many frames (2 seconds at 30fps).
+    __MAX_FRAMES_CHECKING = 60
+
+    # Number of frames left to spend checking the current position.
+    __frames_left = 0
+    __is_dead_end = False
+    # Where the outline was last drawn, or None.
+    __rect = None
+
+    @classmethod
+    def check(cls):
+        '''Check whether the painter is stuck, after it moves or a floor starts.
+        Called when the floor changes.'''
+        cls.__frames_left = cls.__MAX_FRAMES_CHECKING
+        cls.__is_dead_end = False
+
+    @classmethod
+    def prepare_frame(cls):
+        if cls.__frames_left > 0:
+            # The check is spread over several frames if needed,
+            # only doing a little of it each frame.
+            cls.__frames_left -= 1
+            result = HintEngine.is_dead_end()
+            if result is not None:
+                cls.__frames_left = 0
+                cls.__is_dead_end = result
+
+        rect = None
+        if cls.__is_dead_end:
+            topleft_x, topleft_y = FloorVisual.topleft_for(FloorPlayer.get_painter_position())
+            cell_dimens = FloorVisual.get_cell_dimens_no_line()
+            rect = pg.Rect(topleft_x, topleft_y, cell_dimens, cell_dimens)
+        if rect != cls.__rect:
+            if cls.__rect is not None: cls.mark_damaged(cls.__rect)
+            if rect is not None: cls.mark_damaged(rect)
+            cls.__rect = rect
+
+    @classmethod
+    def draw(cls):
+        if cls.__rect is not None:
+            pg.draw.rect(cls._window, cls.__COL, cls.__rect, width=cls.__LINE_SIZE)
@@ -1,134 +1,79 @@
-from ..direction_utility import DirectionUtility
+from .floor_session import FloorSession
 
 class FloorPlayer:
-    '''Interface for the Painter's interactions with the floor.'''
+    '''Interface for the Painter's interactions with the floor being shown.
+    The state is kept in a FloorSession, which these methods are passed on to.
+    Use FloorSession directly to play more than one floor at once.'''
 
-    __DIRECTIONS = [1,-1,2,-2]
+    __DIRECTIONS = list(FloorSession.DIRECTIONS)
+
+    __session = None
 
     @classmethod
     def new_floor(cls, floor_obj):
         '''Initialise the position of the painter, the cell grid to move on,
-        and undo history.'''
-        cls._painter_pos = floor_obj.get_initial_painter_position()
-        cls._grid = floor_obj.get_cell_grid()
-        cls.__position_history = [] # Series of positions occupied
-        cls.__direction_history = [] # Same length: history of directions faced
+        and undo history, by starting a new session.'''
+        cls.__session = FloorSession(floor_obj)
+
+    @classmethod
+    def get_session(cls) -> FloorSession:
+        return cls.__session
 
     @classmethod
     def painter_position_after_move(cls, direction: int, start_pos: tuple[int]=None):
         '''The direction argument indicates a direction to move.
         1 : Right, -1 : Left
         2 : Down, -2 : Up
-        
+
         Return the position the painter would be in after
         moving in that direction once.'''
+        return cls.__session.painter_position_after_move(direction, start_pos)
 
-        # Calculate new position of the painter after moving
-        x, y = cls._painter_pos or start_pos
-        grid_w, grid_h = cls._grid.get_size()
-
-        return DirectionUtility.pos_after_move(x,y,grid_w,grid_h,direction)
-    
     @classmethod
     def adjacents_to(cls, pos: tuple[int]=None) -> list:
         '''Returns the list of cells one move from the given position,
         or if None, from the painter's current position.
         Does not check if those cells are painted.
-        
-        Used ingame when checking if a mouse click is on a cell that can be moved to,
-        and in the editor when checking whether a floor is possible to solve.'''
-        
-        return [
-            cls.painter_position_after_move(direc, start_pos=pos)
-            for direc in cls.__DIRECTIONS
-        ]
-    
+
+        Used ingame when checking if a mouse click is on a cell that can be moved to.'''
+        return cls.__session.adjacents_to(pos)
+
     @classmethod
     def get_directions(cls):
         return cls.__DIRECTIONS
-    
+
+    @classmethod
+    def get_painter_position(cls):
+        return cls.__session.get_painter_position()
+
+    @classmethod
+    def get_cell_grid(cls):
+        return cls.__session.get_cell_grid()
+
     @classmethod
     def move_painter(cls, new_pos: tuple, direction: int=-2):
         '''Move the painter to the new position.
-
         Returns a boolean for whether the move worked.
-        True : moved, False : blocked by wet paint.
-        
-        The direction the painter moved, and thus the painter visual should face,
-        is passed so it can be stored in position history, for reference when undoing.'''
-
-        try:
-            # Raise ValueError if the position is not on the grid or is full.
-            new_cell = cls._grid[new_pos]
-            if new_cell.get_full(): raise ValueError
-
-            # Paint the old position.
-            old_cell = cls._grid[cls._painter_pos]
-            old_cell.paint()
-        except ValueError:
-            # The move is not possible.
-            # The PainterVisual class does a SFX/animation/effect.
-            return False
-        else:
-            # Move painter, add old position to history
-            cls.__position_history.append(cls._painter_pos)
-            cls.__direction_history.append(direction)
-            cls._painter_pos = new_pos
-            cls.__painter_dir = direction
-            return True
-        
+        True : moved, False : blocked by wet paint.'''
+        return cls.__session.move_painter(new_pos, direction)
+
     @classmethod
     def undo(cls):
         '''Undo the painter's last move.
-
         If the undo worked, return the painter's new position and direction.
         Tuple : Move was undone, None : No moves to undo'''
-        if len(cls.__position_history) == 0: return None
+        return cls.__session.undo()
 
-        prev_pos = cls.__position_history.pop()
-
-        prev_cell = cls._grid[prev_pos]
-        prev_cell.revert()
-        cls._painter_pos = prev_pos
-
-        prev_dir = cls.__direction_history.pop()
-
-        return prev_pos, prev_dir
-    
     @classmethod
     def undo_all(cls):
         '''Undo all the painter's moves.
-        
         If the undo worked, return the painter's initial position.
-        Tuple : All moves undone, False : No moves to undo
-        '''
-        
-        # Attempt to undo once.
-        has_moved = cls.undo()
-
-        if has_moved:
-            # If the painter moved, repeatedly call undo()
-            # until all moves are undone. 
-            while cls.undo(): pass
-            return cls._painter_pos, cls.__painter_dir
-        else:
-            return None
-        
+        Tuple : All moves undone, None : No moves to undo'''
+        return cls.__session.undo_all()
+
     @classmethod
     def floor_is_over(cls):
         '''Return a boolean for whether the floor is clear.
         True : Well done, move on, False : More to paint
-        Delegates to CellGrid.is_painted().
-
-        If it would return True, also paint the square the painter is on,
-        so the graphics will show the entire floor being painted.'''
-
-        done = cls._grid.is_painted()
-        if done:
-            cls._grid[cls._painter_pos].paint()
-            # Add this final cell to position history:
-            # when choosing to play the floor again,
-            # it needs to be unpainted as well.
-            cls.__position_history.append(cls._painter_pos)
-            cls.__direction_history.append(cls.__painter_dir)
-        return done
\ No newline at end of file
+        If it would return True, also paint the square the painter is on.'''
+        return cls.__session.floor_is_over()
@@ -0,0 +1,133 @@
+from ..direction_utility import DirectionUtility
+
+class FloorSession:
+    '''One game of a floor: the cell grid being painted, the painter's position,
+    and the undo history.
+
+    Each session has its own state, so many can be played at once in one process
+    (e.g. bots playing floors in bulk, or a server running several games),
+    as long as each is given its own floor, e.g. from FloorData.clone().
+    FloorPlayer keeps a session for the game being shown on screen.'''
+
+    DIRECTIONS = (1,-1,2,-2)
+
+    def __init__(self, floor_obj):
+        '''Start a game of the given floor.
+        Moves paint the floor's own cell grid.'''
+        self.__painter_pos = floor_obj.get_initial_painter_position()
+        self.__painter_dir = -2
+        self.__grid = floor_obj.get_cell_grid()
+        self.__position_history = [] # Series of positions occupied
+        self.__direction_history = [] # Same length: history of directions faced
+
+    def painter_position_after_move(self, direction: int, start_pos: tuple[int]=None):
+        '''The direction argument indicates a direction to move.
+        1 : Right, -1 : Left
+        2 : Down, -2 : Up
+
+        Return the position the painter would be in after
+        moving in that direction once from the start position,
+        or if None, from the painter's current position.'''
+
+        x, y = start_pos or self.__painter_pos
+        grid_w, grid_h = self.__grid.get_size()
+
+        return DirectionUtility.pos_after_move(x,y,grid_w,grid_h,direction)
+
+    def adjacents_to(self, pos: tuple[int]=None) -> list:
+        '''Returns the list of cells one move from the given position,
+        or if None, from the painter's current position.
+        Does not check if those cells are painted.'''
+
+        return [
+            self.painter_position_after_move(direc, start_pos=pos)
+            for direc in self.DIRECTIONS
+        ]
+
+    def get_painter_position(self):
+        return self.__painter_pos
+
+    def get_cell_grid(self):
+        return self.__grid
+
+    def move_painter(self, new_pos: tuple, direction: int=-2):
+        '''Move the painter to the new position.
+
+        Returns a boolean for whether the move worked.
+        True : moved, False : blocked by wet paint.
+
+        The direction the painter moved, and thus the painter visual should face,
+        is passed so it can be stored in position history, for reference when undoing.'''
+
+        try:
+            # Raise ValueError if the position is not on the grid or is full.
+            new_cell = self.__grid[new_pos]
+            if new_cell.get_full(): raise ValueError
+
+            # Paint the old position.
+            old_cell = self.__grid[self.__painter_pos]
+            old_cell.paint()
+        except ValueError:
+            # The move is not possible.
+            # The PainterVisual class does a SFX/animation/effect.
+            return False
+        else:
+            # Move painter, add old position to history
+            self.__position_history.append(self.__painter_pos)
+            self.__direction_history.append(direction)
+            self.__painter_pos = new_pos
+            self.__painter_dir = direction
+            return True
+
+    def undo(self):
+        '''Undo the painter's last move.
+
+        If the undo worked, return the painter's new position and direction.
+        Tuple : Move was undone, None : No moves to undo'''
+        if len(self.__position_history) == 0: return None
+
+        prev_pos = self.__position_history.pop()
+
+        prev_cell = self.__grid[prev_pos]
+        prev_cell.revert()
+        self.__painter_pos = prev_pos
+
+        prev_dir = self.__direction_history.pop()
+
+        return prev_pos, prev_dir
+
+    def undo_all(self):
+        '''Undo all the painter's moves.
+
+        If the undo worked, return the painter's initial position.
+        Tuple : All moves undone, None : No moves to undo
+        '''
+
+        # Attempt to undo once.
+        has_moved = self.undo()
+
+        if has_moved:
+            # If the painter moved, repeatedly call undo()
+            # until all moves are undone.
+            while self.undo(): pass
+            return self.__painter_pos, self.__painter_dir
+        else:
+            return None
+
+    def floor_is_over(self):
+        '''Return a boolean for whether the floor is clear.
+        True : Well done, move on, False : More to paint
+        Delegates to CellGrid.is_painted().
+
+        If it would return True, also paint the square the painter is on,
+        so the graphics will show the entire floor being painted.'''
+
+        done = self.__grid.is_painted()
+        if done:
+            self.__grid[self.__painter_pos].paint()
+            # Add this final cell to position history:
+            # when choosing to play the floor again,
+            # it needs to be unpainted as well.
+            self.__position_history.append(self.__painter_pos)
+            self.__direction_history.append(self.__painter_dir)
+        return done
@@ -2,20 +2,28 @@ from ..abstract_handlers import VisualHandler
 import pygame as pg
 
 class FloorVisual(VisualHandler):
-    '''Class that draws graphics for an ingame level (floor)'''
+    '''Class that draws graphics for an ingame level (floor).
+
+    The floor is drawn once per floor onto a cached surface, which is blitted every frame.
+    The grid lines are kept on a surface of their own, so when cells are painted or unpainted,
+    only they (and the paint outside the grid for cells on its edges) are drawn again,
+    on top of the lines copied from that surface.'''
+    # Cells that are painted or unpainted are found in prepare_frame().
+    _TRACKS_DAMAGE = True
     __LINE_SIZE = 4
     __LINE_COL = pg.Color(255,255,255)
     __WRAP_LINE_COL = pg.Color(60,60,60)
     __PAINT_COL = pg.Color(150,30,30)
     __WRAP_PAINT_COL = pg.Color(75,15,15)
-    __BG_COL = pg.Color(0,0,0)
     __EDITOR_HEIGHT_FRAC = 1.25
 
+    # Cell the mouse was over when hover() was last called.
+    __hovered_cell = None
+
     @classmethod
     def new_floor(cls, floor_obj, editor: bool=False):
         '''Set up graphical parameters used to draw the grid for a floor.
-        Called once when the floor starts.'''
-        cls._window.fill(cls.__BG_COL)
+        Called once when the floor starts, or it's resized in the editor.'''
 
         # Retrieve size of grid (in cells)
         # and dimensions of the game window (in pixels)
@@ -44,48 +52,106 @@ class FloorVisual(VisualHandler):
         cls.__top_edge = (win_h - all_cells_h) // 2
         cls.__bottom_edge = win_h - cls.__top_edge
 
+        # Draw the lines, which don't change until the next floor.
+        cls.__lines_surf = pg.Surface(cls._window_dimensions, 0, cls._window)
+        cls.__lines_surf.fill(cls._BG_COL)
+        cls.__draw_lines(cls.__lines_surf)
+
+        # Draw the painted cells on top, on the surface blitted by draw().
+        cls.__floor_surf = cls.__lines_surf.copy()
+        for cell_pos in cls.__grid.get_full_cell_positions():
+            cls.__draw_paint_for_cell(cell_pos)
+
+        # Bitmask of the cells that were full when the floor was last drawn (see CellGrid.get_full_mask()).
+        cls.__drawn_mask = cls.__grid.get_full_mask()
+        cls.__hovered_cell = None
+        cls.mark_damaged()
+
+    @classmethod
+    def prepare_frame(cls):
+        '''Draw the cells that have been painted or unpainted since the last frame
+        (by moving, undoing, or editing) again, and mark them as damaged,
+        along with the paint outside the grid for cells on its edges.'''
+        mask = cls.__grid.get_full_mask()
+        changed = mask ^ cls.__drawn_mask
+        if not changed: return
+        cls.__drawn_mask = mask
+
+        grid_w, grid_h = cls.__grid.get_size()
+        win_w, win_h = cls._window_dimensions
+        cell_dimens = cls.get_cell_dimens_no_line()
+        rects = []
+        # Cells whose paint might be in those rects.
+        cells_to_paint = set()
+        while changed:
+            bit = changed & -changed
+            changed ^= bit
+            index = bit.bit_length() - 1
+            x, y = index % grid_w, index // grid_w
+            pixel_x, pixel_y = cls.topleft_for((x, y))
+            rects.append(pg.Rect(pixel_x, pixel_y, cell_dimens, cell_dimens))
+            cells_to_paint.add((x, y))
+            # Paint outside the grid goes to the edges of the window,
+            # and is drawn for the cells at either end of the row or column.
+            if x == 0 or x == grid_w - 1:
+                rects.append(pg.Rect(0, pixel_y, win_w, cell_dimens))
+                cells_to_paint.update((row_x, y) for row_x in range(grid_w))
+            if y == 0 or y == grid_h - 1:
+                rects.append(pg.Rect(pixel_x, 0, cell_dimens, win_h))
+                cells_to_paint.update((x, column_y) for column_y in range(grid_h))
+
+        for rect in rects:
+            cls.__floor_surf.blit(cls.__lines_surf, rect, rect)
+            cls.mark_damaged(rect)
+        for cell_pos in cells_to_paint:
+            if cls.__grid[cell_pos].get_full(): cls.__draw_paint_for_cell(cell_pos)
+
     @classmethod
     def draw(cls):
         '''Draw the floor on the screen,
         with lines to show the grid and painted cells filled in.'''
+        cls._window.blit(cls.__floor_surf, (0, 0))
+
+    @classmethod
+    def __draw_lines(cls, surf):
+        '''Draw the lines of the grid, and the faded lines continuing them to the edges of the window.'''
         win_w, win_h = cls._window_dimensions
 
         # Draw vertical lines
         for x in range(cls.__left_edge, cls.__right_edge + 1,
                        cls.__cell_dimens):
             
-            cls.__draw_line((x, cls.__top_edge), (x, cls.__bottom_edge))
-            cls.__draw_line((x, 0), (x, cls.__top_edge), faded=True)
-            cls.__draw_line((x, cls.__bottom_edge), (x, win_h), faded=True)
+            cls.__draw_line(surf, (x, cls.__top_edge), (x, cls.__bottom_edge))
+            cls.__draw_line(surf, (x, 0), (x, cls.__top_edge), faded=True)
+            cls.__draw_line(surf, (x, cls.__bottom_edge), (x, win_h), faded=True)
         
         # Draw horizontal lines
         for y in range(cls.__top_edge, cls.__bottom_edge + 1,
                        cls.__cell_dimens):
             
-            cls.__draw_line((cls.__left_edge, y), (cls.__right_edge, y))
-            cls.__draw_line((0, y), (cls.__left_edge, y), faded=True)
-            cls.__draw_line((cls.__right_edge, y), (win_w, y), faded=True)
-        
-        grd_w, grd_h = cls.__grid.get_size()
-        
-        # Fill in the painted cells
-        for cell_pos in cls.__grid.get_full_cell_positions():
+            cls.__draw_line(surf, (cls.__left_edge, y), (cls.__right_edge, y))
+            cls.__draw_line(surf, (0, y), (cls.__left_edge, y), faded=True)
+            cls.__draw_line(surf, (cls.__right_edge, y), (win_w, y), faded=True)
 
-            # Add paint
-            cls.__draw_paint(cell_pos)
+    @classmethod
+    def __draw_paint_for_cell(cls, cell_pos: tuple):
+        '''Draw paint in the full cell at the given position on the cached floor surface.'''
+        # Add paint
+        cls.__draw_paint(cell_pos)
 
-            # If the cell is on the edge of the grid,
-            # also draw paint outside the grid to indicate
-            # the painter can't go to the opposite side.
-            x, y = cell_pos
-            
-            if x == 0 or x == grd_w - 1:
-                cls.__draw_paint((grd_w, y), extend=2)
-                cls.__draw_paint((-1, y), extend=1)
+        # If the cell is on the edge of the grid,
+        # also draw paint outside the grid to indicate
+        # the painter can't go to the opposite side.
+        grd_w, grd_h = cls.__grid.get_size()
+        x, y = cell_pos
+        
+        if x == 0 or x == grd_w - 1:
+            cls.__draw_paint((grd_w, y), extend=2)
+            cls.__draw_paint((-1, y), extend=1)
 
-            if y == 0 or y == grd_h - 1:
-                cls.__draw_paint((x, grd_h), extend=4)
-                cls.__draw_paint((x, -1), extend=3)
+        if y == 0 or y == grd_h - 1:
+            cls.__draw_paint((x, grd_h), extend=4)
+            cls.__draw_paint((x, -1), extend=3)
 
     @classmethod
     def __draw_paint(cls, cell_pos: tuple, extend: int=0):
@@ -123,22 +189,22 @@ class FloorVisual(VisualHandler):
                 y_dimens = (win_h - pixel_y)
 
         # Draw a filled square
-        pg.draw.rect(cls._window, colour,
+        pg.draw.rect(cls.__floor_surf, colour,
                     (pixel_x, pixel_y, x_dimens, y_dimens))
         
     @classmethod
-    def __draw_line(cls, start: tuple, end: tuple, faded: bool=False):
+    def __draw_line(cls, surf, start: tuple, end: tuple, faded: bool=False):
         '''Private method used to shorten the call to pg.draw.line().
         Faded argument indicates the faded colour used for the lines
         that indicate the ability to wrap around from one edge to the other.'''
         col = faded and cls.__WRAP_LINE_COL or cls.__LINE_COL
-        pg.draw.line(cls._window, col, start, end, width=cls.__LINE_SIZE)
+        pg.draw.line(surf, col, start, end, width=cls.__LINE_SIZE)
 
     @classmethod
     def topleft_for(cls, cell_pos: tuple):
         '''Return the pixel position of the top left corner
         of the cell at the given grid position.
-        Called in draw() and also PainterVisual.draw()'''
+        Called in draw() and also PainterVisual.prepare_frame()'''
         x, y = cell_pos
         # Add line size to go over the cell border, and subtract 1 because
         # coordinates start from 0,0
@@ -152,13 +218,31 @@ class FloorVisual(VisualHandler):
     
     @classmethod
     def get_coordinates_of_cell_clicked(cls, mouse_x: int, mouse_y: int) -> tuple | None:
-        cell_dimens = cls.get_cell_dimens_no_line()
+        '''Return the grid position of the cell at the given pixel position,
+        or None if it's on a line between cells or outside the grid (e.g. on the paint past the edges).
+        Worked out from the layout found in new_floor(), rather than by checking every cell.'''
         grid_w, grid_h = cls.__grid.get_size()
-        # Iterate through the grid, checking if the click is within a cell.
-        for x in range(0, grid_w):
-            for y in range(0, grid_h):
-                left_x, top_y = FloorVisual.topleft_for((x, y))
-                if left_x <= mouse_x <= left_x + cell_dimens and \
-                top_y <= mouse_y <= top_y + cell_dimens:
-                    return (x,y)
-        return None
\ No newline at end of file
+        # Each cell_dimens pixels along is the line before a cell, then the cell itself,
+        # which starts on the line's last pixel (see topleft_for()).
+        x, x_into_cell = divmod(mouse_x - cls.__left_edge, cls.__cell_dimens)
+        y, y_into_cell = divmod(mouse_y - cls.__top_edge, cls.__cell_dimens)
+        if not (0 <= x < grid_w and 0 <= y < grid_h): return None
+        if x_into_cell < cls.__LINE_SIZE - 1 or y_into_cell < cls.__LINE_SIZE - 1: return None
+        return (x, y)
+
+    @classmethod
+    def hover(cls, mouse_x: int, mouse_y: int) -> bool:
+        '''Note which cell the mouse is over, given its pixel position,
+        and return whether it's a different cell (or no longer a cell) since the last call.
+        Called when the mouse moves, so something only has to be done
+        (e.g. painting while dragging) when it goes into another cell.'''
+        cell_pos = cls.get_coordinates_of_cell_clicked(mouse_x, mouse_y)
+        if cell_pos == cls.__hovered_cell: return False
+        cls.__hovered_cell = cell_pos
+        return True
+
+    @classmethod
+    def get_hovered_cell(cls) -> tuple | None:
+        '''Return the grid position of the cell the mouse was over when hover() was last called,
+        or None if it wasn't over one.'''
+        return cls.__hovered_cell
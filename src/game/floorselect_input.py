@@ -1,6 +1,7 @@
 from ..abstract_handlers import ArbitraryOptionsControlWithBackButton
 from ..audio_utility import SFXPlayer
 from ..floor_manager import FloorManager
+from ..error_report import ErrorReportControl
 
 class LevelSelectControl(ArbitraryOptionsControlWithBackButton):
     '''Input handler for floor selection.'''
@@ -50,6 +51,10 @@ class FloorpackSelectControl(ArbitraryOptionsControlWithBackButton):
         and switch to the floor select state.'''
 
         # Select the floorpack corresponding to the option.
-        FloorManager.select_floorpack(self._option_id)
+        try: FloorManager.select_floorpack(self._option_id)
+        except TypeError:
+            # The file has changed since the game started: it's no longer on the menu.
+            ErrorReportControl.set_state_after_dismiss('FloorpackSelectState')
+            return 'ErrorState'
         SFXPlayer.play_sfx('menu')
         return 'LevelSelectState'
\ No newline at end of file
@@ -9,6 +9,8 @@ from .floorselect_input import LevelSelectControl, FloorpackSelectControl
 from .painter_visual import PainterVisual
 from .floor_visual import FloorVisual
 from .menu_button_visual import MenuButtonVisual
+from .hint_visual import HintVisual
+from .dead_end_visual import DeadEndVisual
 from .floor_player import FloorPlayer
 
 class GameStartState(State):
@@ -28,7 +30,11 @@ class NewFloorState(State):
     @classmethod
     def enter(cls):
         '''Get the next floor object and use the program to set it up.'''
-        floor_obj = FloorManager.next_floor()
+        try: floor_obj = FloorManager.next_floor()
+        except TypeError:
+            # The floorpack file is damaged: it's no longer on the menu.
+            ErrorReportControl.set_state_after_dismiss('FloorpackSelectState')
+            return 'ErrorState'
         cls.__start_floor(floor_obj)
         return "GameplayState"
 
@@ -40,6 +46,9 @@ class NewFloorState(State):
         FloorVisual.new_floor(floor_obj)
         # Set up painter control logic to interact with the new floor.
         FloorPlayer.new_floor(floor_obj)
+        # Remove any hint shown on the last floor.
+        HintVisual.clear()
+        DeadEndVisual.check()
 
         # Set visual parameters of the painter graphic based on
         # the dimension of a cell on the new floor.
@@ -58,7 +67,7 @@ class GameplayState(State):
     '''The player is painting the floor in gameplay.'''
 
     _INPUT_HANDLER = PainterControl
-    _VISUAL_HANDLERS = (FloorVisual, PainterVisual, MenuButtonVisual)
+    _VISUAL_HANDLERS = (FloorVisual, HintVisual, DeadEndVisual, PainterVisual, MenuButtonVisual)
 
 class PauseMenuState(FixedOptionsSelectState):
     '''The player is playing a floor and has pressed CTRL to pause.
@@ -125,7 +134,11 @@ class FloorpackSelectState(GameContentSelectState):
 
         # If there's only one floorpack, select it
         if len(packnames) == 1:
-            FloorManager.select_floorpack(packnames[0])
+            try: FloorManager.select_floorpack(packnames[0])
+            except TypeError:
+                # It's no longer on the menu, so this won't happen again.
+                ErrorReportControl.set_state_after_dismiss('FloorpackSelectState')
+                return 'ErrorState'
             return 'LevelSelectState'
         
         options = packnames
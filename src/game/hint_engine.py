@@ -0,0 +1,130 @@
+import time
+import weakref
+from ..direction_utility import DirectionUtility
+from ..editor.bitboard_solver import BitboardSolver
+from ..editor.floor_pruner import FloorPruner
+from .floor_player import FloorPlayer
+from .floor_session import FloorSession
+
+class HintEngine:
+    '''Works out a move that keeps the floor possible to clear,
+    from where the painter is now and which cells are painted.
+
+    Every position searched is remembered for each FloorSession, as long as it's in use:
+    the cell to move to next if the floor can be cleared from there, or that it can't be.
+    So asking again after following a hint, or after undoing, is answered
+    straight away rather than searching again.
+    The same search is used to check whether the painter has got stuck after every move.'''
+
+    # Maximum on number of new positions searched for one hint,
+    # so the game doesn't freeze.
+    __NODE_LIMIT = 20000
+    # Maximum time in seconds spent searching each time is_dead_end() is called,
+    # so that it fits in a frame (33ms at 30fps) along with drawing.
+    __DEAD_END_TIME_LIMIT = 0.01
+    # Forget everything if this many positions are remembered.
+    __MAX_MEMO_SIZE = 500000
+
+    # Stored for a position where the floor can't be cleared.
+    __DEAD_END = -1
+
+    # Maps each FloorSession to its memo, which maps
+    # (painter's cell index, bitmask of empty cells not including the painter's)
+    # to the index of the cell to move to, or __DEAD_END.
+    # The index is None if there are no cells left to paint.
+    __memos = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def next_move(cls, session: FloorSession=None) -> int | None:
+        '''Return a direction the painter can move in, such that the floor can still be cleared.
+        Return None if the floor can't be cleared from here.
+        If working this out would be overly time-consuming, raise ValueError.
+        The session defaults to FloorPlayer's.'''
+        memo, width, height, pos, remaining = cls.__current_position(session)
+        if not FloorPruner.parity_allows(width, height, pos, remaining): return None
+        if not cls.__search(memo, width, height, pos, remaining, node_limit=cls.__NODE_LIMIT): return None
+
+        next_index = memo[(pos, remaining)]
+        if next_index is None: return None
+        pos_x, pos_y = pos % width, pos // width
+        for direc in FloorSession.DIRECTIONS:
+            adj_x, adj_y = DirectionUtility.pos_after_move(pos_x, pos_y, width, height, direc)
+            if adj_y * width + adj_x == next_index: return direc
+
+    @classmethod
+    def is_dead_end(cls, session: FloorSession=None) -> bool | None:
+        '''Return True if the floor can't be cleared from the current position,
+        False if it can, and None if that isn't known yet.
+        Only a small part of the search is done in each call, but what's found is remembered,
+        so calling again (e.g. on the next frame) carries on from where it got to.
+        The session defaults to FloorPlayer's.'''
+        memo, width, height, pos, remaining = cls.__current_position(session)
+        if not FloorPruner.parity_allows(width, height, pos, remaining): return True
+        deadline = time.perf_counter() + cls.__DEAD_END_TIME_LIMIT
+        try: return not cls.__search(memo, width, height, pos, remaining, None, deadline)
+        except ValueError: return None
+
+    @classmethod
+    def __current_position(cls, session: FloorSession=None) -> tuple:
+        '''Return the memo for the session, the width and height of its floor,
+        the index of the painter's cell, and a bitmask of the empty cells other than the painter's.
+        The memo is started again if it's got too big.'''
+        if session is None: session = FloorPlayer.get_session()
+        memo = cls.__memos.get(session)
+        if memo is None or len(memo) > cls.__MAX_MEMO_SIZE:
+            memo = {}
+            cls.__memos[session] = memo
+
+        grid = session.get_cell_grid()
+        width, height = grid.get_size()
+        remaining = ((1 << (width * height)) - 1) & ~grid.get_full_mask()
+        pos_x, pos_y = session.get_painter_position()
+        pos = pos_y * width + pos_x
+        return memo, width, height, pos, remaining & ~(1 << pos)
+
+    @classmethod
+    def __search(cls, memo: dict, width: int, height: int, start: int, remaining: int,
+                 node_limit: int=None, deadline: float=None) -> bool:
+        '''Depth-first search from the start index over the remaining cells,
+        remembering the result for every position that is fully searched in the given memo.
+        Return whether the floor can be cleared.
+        If more than node_limit new positions are searched,
+        or time.perf_counter() passes the deadline, raise ValueError.'''
+        neighbours = BitboardSolver.neighbour_masks(width, height)
+        DEAD_END = cls.__DEAD_END
+        nodes = 0
+
+        def visit(pos: int, remaining: int, check_connected: bool) -> bool:
+            nonlocal nodes
+            key = (pos, remaining)
+            if key in memo: return memo[key] != DEAD_END
+            nodes += 1
+            if node_limit is not None and nodes > node_limit: raise ValueError
+            if deadline is not None and time.perf_counter() > deadline: raise ValueError
+
+            if remaining == 0:
+                memo[key] = None
+                return True
+            if not FloorPruner.can_finish(width, height, pos, remaining, check_connected):
+                memo[key] = DEAD_END
+                return False
+
+            moves = neighbours[pos] & remaining
+            targets = []
+            while moves:
+                bit = moves & -moves
+                moves ^= bit
+                targets.append(bit.bit_length() - 1)
+
+            # Try cells with the fewest onward moves first (Warnsdorff's rule).
+            targets.sort(key=lambda index: (neighbours[index] & remaining).bit_count())
+            for index in targets:
+                # Painting a cell with one empty neighbour can't split up the empty cells.
+                after = remaining & ~(1 << index)
+                if visit(index, after, (neighbours[index] & after).bit_count() > 1):
+                    memo[key] = index
+                    return True
+            memo[key] = DEAD_END
+            return False
+
+        return visit(start, remaining, True)
@@ -0,0 +1,35 @@
+from ..abstract_handlers import VisualHandler
+from .floor_visual import FloorVisual
+import pygame as pg
+
+class HintVisual(VisualHandler):
+    '''Outlines the cell the painter should move to next, when the player asks for a hint.'''
+    __COL = pg.Color(60, 200, 255)
+    __LINE_SIZE = 4
+    # The outlined cell is marked as damaged when it changes.
+    _TRACKS_DAMAGE = True
+
+    __position = None
+
+    @classmethod
+    def show(cls, pos: tuple):
+        '''Outline the cell at the given position, until clear() is called.'''
+        cls.clear()
+        cls.__position = pos
+        cls.mark_damaged(cls.__rect())
+
+    @classmethod
+    def clear(cls):
+        if cls.__position is not None: cls.mark_damaged(cls.__rect())
+        cls.__position = None
+
+    @classmethod
+    def __rect(cls):
+        topleft_x, topleft_y = FloorVisual.topleft_for(cls.__position)
+        cell_dimens = FloorVisual.get_cell_dimens_no_line()
+        return pg.Rect(topleft_x, topleft_y, cell_dimens, cell_dimens)
+
+    @classmethod
+    def draw(cls):
+        if cls.__position is None: return
+        pg.draw.rect(cls._window, cls.__COL, cls.__rect(), width=cls.__LINE_SIZE)
@@ -8,12 +8,14 @@ class MenuButtonVisual(VisualHandler):
     __BG_COL = pg.Color(200,200,200)
     __TEXT_COL = pg.Color(0,0,0)
     _TEXT = 'Menu\n(Esc)'
+    # Never changes.
+    _TRACKS_DAMAGE = True
 
     @classmethod
     def draw(cls):
         pg.draw.rect(cls._window, cls.__BG_COL, cls.__BUTTON_RECT, border_radius=cls.__BUTTON_CORNER_RADIUS)
         font = FontManager.get_font()
-        text = font.render(cls._TEXT, True, cls.__TEXT_COL)
+        text = FontManager.render(font, cls._TEXT, cls.__TEXT_COL)
         cls._window.blit(text, (0,0))
 
     @classmethod
@@ -7,7 +7,10 @@ from ..font_utility import FontManager
 class MenuVisual(VisualHandler):
     '''A visual for menus where the player chooses a numbered option.
     Unlike the other visual handlers an instance is created rather than using the class:
-    this is because the options can vary but the logic is the same.'''
+    this is because the options can vary but the logic is the same.
+
+    Each page of the menu is drawn once onto a surface of its own, which is blitted when drawing,
+    until the title changes.'''
 
     __OPTIONS_PER_PAGE = 9 # Maximum of 9, to correspond with the number keys 1-9
     __PADDING_PX = 4 # Used for option padding and rounding of corners
@@ -15,12 +18,16 @@ class MenuVisual(VisualHandler):
 
     __TEXT_COL = pg.Color(0,0,0)
     __BG_COL = pg.Color(200,200,200)
+    # The menu is marked as damaged when it changes page or title.
+    _TRACKS_DAMAGE = True
 
     def __init__(self, title: str, options: list[str], option_ids: list[str]=[]):
         self.__title = title
         self.__options = options
         self.__option_ids = option_ids
         self.__page_index = 0
+        # Page indexes to surfaces with the menu drawn on them.
+        self.__page_surfs = {}
         self.__num_pages = ceil(len(options) / self.__class__.__OPTIONS_PER_PAGE)
         self.__is_multi_page = self.__num_pages > 1
 
@@ -96,18 +103,29 @@ class MenuVisual(VisualHandler):
         return LEFT_ARROW + ' ' * (menu_width // ARROW_WIDTH - 1) + RIGHT_ARROW
 
     def draw(self):
+        page_surf = self.__page_surfs.get(self.__page_index)
+        if page_surf is None:
+            page_surf = self.__draw_page()
+            self.__page_surfs[self.__page_index] = page_surf
+        self.__class__._window.blit(page_surf, (self.__left_edge, self.__top_edge))
+
+    def __draw_page(self):
+        '''Return a new surface with the current page of the menu drawn on it.'''
+        # Transparent, for the rounded corners
+        page_surf = pg.Surface((self.__width, self.__height), pg.SRCALPHA)
+
         # Draw background rect
-        pg.draw.rect(self.__class__._window, self.__class__.__BG_COL,
-                     (self.__left_edge, self.__top_edge, self.__width, self.__height),
+        pg.draw.rect(page_surf, self.__class__.__BG_COL,
+                     (0, 0, self.__width, self.__height),
                      border_radius = self.__class__.__PADDING_PX)
         
         # Draw title
         full_title = self.__append_page_info(self.__title)
-        self.__draw_menu_row(full_title, self.__top_edge, heading=True)
+        self.__draw_menu_row(page_surf, full_title, 0, heading=True)
 
         # Draw arrows: clicked to change page
         if self.__is_multi_page:
-            self.__draw_menu_row(self.__arrows_string, self.__top_edge + self.__row_height, heading=True)
+            self.__draw_menu_row(page_surf, self.__arrows_string, self.__row_height, heading=True)
 
         cur_options = self.__option_names_on_current_page()
 
@@ -115,12 +133,13 @@ class MenuVisual(VisualHandler):
         # If we are on the last page and there are fewer options left than OPTIONS_PER_PAGE
         # then zip() will truncate the range of y positions.
         for index, option_info in enumerate(zip(cur_options,
-            range(self.__top_of_options,
-                  self.__bottom_edge, self.__row_height))):
+            range(self.__top_of_options - self.__top_edge,
+                  self.__height, self.__row_height))):
 
             option, top_y = option_info
             full_option = self.__prepend_key(option, index)
-            self.__draw_menu_row(full_option, top_y)
+            self.__draw_menu_row(page_surf, full_option, top_y)
+        return page_surf
 
     def __option_names_on_current_page(self) -> list:
         '''Slice the list of option names to return the options on the current page.'''
@@ -131,13 +150,13 @@ class MenuVisual(VisualHandler):
         '''Return the index of the first option on the given page index.'''
         return page_index * self.__class__.__OPTIONS_PER_PAGE
     
-    def __draw_menu_row(self, content: str, top: int, heading: bool=False):
-        '''Render the given content string, with padding separating it from
-        the left edge of the menu and from the given y position for the top of the row.
+    def __draw_menu_row(self, page_surf, content: str, top: int, heading: bool=False):
+        '''Render the given content string onto the surface for a page, with padding separating it from
+        the left edge of the menu and from the given y position (from the top of the menu) for the top of the row.
         If heading is True, use the larger font and centre the text.'''
 
         # Find topleft corner of the option
-        left = self.__left_edge + self.__class__.__PADDING_PX
+        left = self.__class__.__PADDING_PX
         top += self.__class__.__PADDING_PX
 
         # Select font to use
@@ -148,8 +167,8 @@ class MenuVisual(VisualHandler):
             text_w, _ = font.size(content)
             left += (self.__width - text_w) // 2     
 
-        text_surf = font.render(content, True, self.__class__.__TEXT_COL)
-        self.__class__._window.blit(text_surf, (left, top))
+        text_surf = FontManager.render(font, content, self.__class__.__TEXT_COL)
+        page_surf.blit(text_surf, (left, top))
 
     def option_for_number(self, number_pressed: int):
         '''Given that the options on a page are numbered 1 to __OPTIONS_PER_PAGE,
@@ -219,6 +238,7 @@ class MenuVisual(VisualHandler):
         if self.__page_index + 1 < self.__num_pages:
             SFXPlayer.play_sfx('move')
             self.__page_index += 1
+            self.__mark_damaged()
         else: SFXPlayer.play_sfx('invalid')
 
     def prev_page(self):
@@ -227,6 +247,7 @@ class MenuVisual(VisualHandler):
         if self.__page_index > 0:
             SFXPlayer.play_sfx('move')
             self.__page_index -= 1
+            self.__mark_damaged()
         else: SFXPlayer.play_sfx('invalid')
 
     def get_options_per_page(self):
@@ -239,6 +260,11 @@ class MenuVisual(VisualHandler):
         Called during unit tests to visually indicate a chosen option.
         Because this is only for testing it will not resize the menu to properly contain the title.'''
         self.__title = new_title
+        self.__page_surfs.clear()
+        self.__mark_damaged()
+
+    def __mark_damaged(self):
+        self.mark_damaged((self.__left_edge, self.__top_edge, self.__width, self.__height))
 
     def get_title(self):
         '''Return the title of this menu. Used to identify it for debugging.'''
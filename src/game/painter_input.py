@@ -6,10 +6,13 @@ from .painter_visual import PainterVisual
 from .floor_player import FloorPlayer
 from .floor_visual import FloorVisual
 from .menu_button_visual import MenuButtonVisual
+from .hint_engine import HintEngine
+from .hint_visual import HintVisual
+from .dead_end_visual import DeadEndVisual
 
 class PainterControl(KeyboardInputHandler):
     '''Input handler for when playing a level.
-    Move with the arrows, use backspace to undo,
+    Move with the arrows, use backspace to undo, h for a hint,
     and control or escape to open the menu.'''
     _ACTIONS = {
         pg.K_RIGHT : ('move', 1),
@@ -17,6 +20,7 @@ class PainterControl(KeyboardInputHandler):
         pg.K_DOWN : ('move', 2),
         pg.K_UP : ('move', -2),
         pg.K_BACKSPACE : ('undo',),
+        pg.K_h : ('hint',),
         pg.K_LCTRL : ('open_menu',),
         pg.K_RCTRL : ('open_menu',),
         pg.K_ESCAPE : ('open_menu',)
@@ -61,6 +65,8 @@ class PainterControl(KeyboardInputHandler):
         could_move = FloorPlayer.move_painter(new_pos, direction)
 
         if could_move:
+            HintVisual.clear()
+            DeadEndVisual.check()
             PainterVisual.go_to(new_pos, direction)
             SFXPlayer.play_sfx('move')
         else:
@@ -87,8 +93,25 @@ class PainterControl(KeyboardInputHandler):
         else:
             new_pos, new_direction = new_loc
             PainterVisual.go_to(new_pos, new_direction)
+            HintVisual.clear()
+            DeadEndVisual.check()
             SFXPlayer.play_sfx('back')
 
+    @staticmethod
+    def hint():
+        '''Hook that responds to pressing h by showing a cell to move to
+        that keeps the floor possible to clear.
+        If there isn't one, or it would take too long to work out, shake the painter.'''
+        try: direction = HintEngine.next_move()
+        except ValueError: direction = None
+
+        if direction is None:
+            PainterVisual.shake()
+            SFXPlayer.play_sfx('invalid')
+        else:
+            HintVisual.show(FloorPlayer.painter_position_after_move(direction))
+            SFXPlayer.play_sfx('menu')
+
     @staticmethod
     def open_menu():
         '''Hook that responds to pressing control by opening the menu.'''
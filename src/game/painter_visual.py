@@ -1,8 +1,11 @@
 from ..abstract_handlers import VisualHandler
 from .floor_visual import FloorVisual
+import math
 import pygame as pg
 
 class PainterVisual(VisualHandler):
+    # The painter's position is worked out in prepare_frame(), and its old and new areas marked as damaged.
+    _TRACKS_DAMAGE = True
     __COL = pg.Color(255, 60, 60)
     __PADDING_FRACTION = 8
     __SHAKE_FRACTION = 3
@@ -15,6 +18,14 @@ class PainterVisual(VisualHandler):
     ]
     __ARROWHEAD_CENTRE = pg.math.Vector2(1,1.5)
 
+    # Maps each direction to a surface with the arrowhead drawn on it, facing that way,
+    # and the offset from the centre of the arrowhead to the surface's top left.
+    # Made in new_cell_dimens(), so each frame is one blit.
+    __sprites = {}
+    # Rect of the painter when it was last drawn, and the sprite drawn there.
+    __rect = None
+    __sprite = None
+
     #__DEBUG_LINE_COLS = (pg.Color(0,0,255), pg.Color(0,255,0), pg.Color(255,255,0), pg.Color(0,255,255))
 
     @classmethod
@@ -70,9 +81,9 @@ class PainterVisual(VisualHandler):
             cls.__stopping_shake = False
 
     @classmethod
-    def draw(cls):
-        '''Draw the painter onscreen.
-        The painter appears as an arrowhead shape in a cell.'''
+    def prepare_frame(cls):
+        '''Find where the painter will be drawn this frame, moving the shake effect on,
+        and if that's changed, mark where it was and where it will be as damaged.'''
 
         # Get the pixel position of the cell.
         topleft_x, topleft_y = FloorVisual.topleft_for(cls.__position)
@@ -92,12 +103,21 @@ class PainterVisual(VisualHandler):
                 # Facing vertical, so horizontal offset
                 centre_x += cls.__current_shake_amount
 
-        # Find the vertices of the arrowhead shape,
-        # accounting for the direction the painter is facing.
-        vertices = cls.__find_vertices(centre_x, centre_y, cls.__direction)
+        # Find the sprite facing in the direction the painter is facing.
+        sprite, (offset_x, offset_y) = cls.__sprites[cls.__direction]
+        rect = sprite.get_rect(topleft=(centre_x + offset_x, centre_y + offset_y))
+        if rect == cls.__rect and sprite is cls.__sprite: return
 
-        # Draw
-        pg.draw.polygon(cls._window, cls.__COL, vertices)
+        if cls.__rect is not None: cls.mark_damaged(cls.__rect)
+        cls.mark_damaged(rect)
+        cls.__rect = rect
+        cls.__sprite = sprite
+
+    @classmethod
+    def draw(cls):
+        '''Draw the painter onscreen, where prepare_frame() found it should be.
+        The painter appears as an arrowhead shape in a cell.'''
+        cls._window.blit(cls.__sprite, cls.__rect)
 
     @classmethod
     def new_cell_dimens(cls, cell_dimens: int):
@@ -118,14 +138,34 @@ class PainterVisual(VisualHandler):
         # a scale multiplier that makes the vectors fill the space.
         cls.__scale = graphic_dimens / max(
             [vector.magnitude() for vector in cls.__ARROWHEAD])
-            
-    
+
+        # Draw the arrowhead facing each way, so prepare_frame() only has to pick one.
+        cls.__sprites = {direction : cls.__make_sprite(direction) for direction in (1, -1, 2, -2)}
+        cls.__rect = None
+        cls.__sprite = None
+
+    @classmethod
+    def __make_sprite(cls, direction: int) -> tuple:
+        '''Return a surface with the arrowhead drawn on it facing in the given direction,
+        and the offset from the centre of the arrowhead to the surface's top left.
+        The offset is whole pixels, so the arrowhead is drawn exactly as it would be onscreen.'''
+        vertices = cls.__find_vertices(0, 0, direction)
+        offset_x = math.floor(min(vector.x for vector in vertices))
+        offset_y = math.floor(min(vector.y for vector in vertices))
+        width = math.ceil(max(vector.x for vector in vertices)) - offset_x + 1
+        height = math.ceil(max(vector.y for vector in vertices)) - offset_y + 1
+
+        sprite = pg.Surface((width, height), pg.SRCALPHA)
+        pg.draw.polygon(sprite, cls.__COL,
+                        [(vector.x - offset_x, vector.y - offset_y) for vector in vertices])
+        return sprite, (offset_x, offset_y)
+
     @classmethod
     def __find_vertices(cls, x: int, y: int, direction: int):
         '''Return position vectors for the vertices of an
         arrowhead shape centred at the given x,y position
         using the stored scale factor, facing in the given direction.
-        Called in draw().'''
+        Called in __make_sprite().'''
 
         # Facing up by default,
         # find how many degrees to rotate
@@ -2,6 +2,8 @@ import pygame as pg
 from ..abstract_handlers import FixedOptionsControl
 from ..audio_utility import SFXPlayer
 from .painter_visual import PainterVisual
+from .hint_visual import HintVisual
+from .dead_end_visual import DeadEndVisual
 from .floor_player import FloorPlayer
 from ..floor_manager import FloorManager
     
@@ -30,6 +32,8 @@ class RestartExitMenuControl(FixedOptionsControl):
         if new_loc is not None:
             new_pos, _ = new_loc
             PainterVisual.go_to(new_pos)
+        HintVisual.clear()
+        DeadEndVisual.check()
         return 'GameplayState'
     
     @staticmethod
@@ -3,6 +3,7 @@ from .floor_manager import FloorManager
 from .game.game import Game
 from .editor.editor import Editor
 from .app import App
+from .abstract_handlers import VisualHandler
 from .startup_utility import setup_window, setup_state, StartupMenu
 
 class GameAndEditor(App):
@@ -36,6 +37,8 @@ class GameAndEditor(App):
                 else:
                     self.__app = self.__startup_menu
                     self.__starting_up = True
+                    # Draw the startup menu over what the game or editor left on the window.
+                    VisualHandler.mark_damaged()
             case 1:
                 # First option opens the game
                 self.__start_app()
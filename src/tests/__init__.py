@@ -1,6 +1,10 @@
 '''This package contains unit tests.
 The following import statements are used to specify the unittest.TestCase subclasses
-to be used, and which order the tests should occur in.'''
+to be used, and which order the tests should occur in.
+The tests from test4 on don't need the game window or any input,
+so they can be run on their own, e.g. python -m unittest src.tests.test4_solvers'''
 from .test1_visuals import GraphicsTest as t1, VfxTest as t2
 from .test2_menu import MenuTest as t3
-from .test3_gameplay import FinalTest as t4
\ No newline at end of file
+from .test3_gameplay import FinalTest as t4
+from .test4_solvers import SolverTest as t5
+from .test5_floorpack_files import FloorpackFormatTest as t6, FloorpackJournalTest as t7
@@ -0,0 +1,25 @@
+import random
+from ..editor.floor_data import FloorData
+from ..floorpack_format import FloorpackFormat
+
+def random_floor(rng: random.Random, max_width: int=4, max_height: int=4, fill_chance: float=0.25):
+    '''Return a FloorData with a random size, starting position and filled cells,
+    for tests that check floors without anyone looking at them.
+    The random.Random is passed in so the same floors are made every time.'''
+    while True:
+        width = rng.randint(1, max_width)
+        height = rng.randint(1, max_height)
+        if FloorData.is_valid_size(width, height): break
+
+    floor = FloorData(width, height)
+    grid = floor.get_cell_grid()
+    for y in range(height):
+        for x in range(width):
+            if rng.random() < fill_chance: grid[(x, y)].start_filled()
+    floor.set_initial_painter_position((rng.randrange(width), rng.randrange(height)))
+    return floor
+
+def floors_as_data(floorpack) -> list:
+    '''Return the plain data for every floor in the floorpack,
+    so two floorpacks can be compared with assertEqual().'''
+    return FloorpackFormat.to_data(floorpack)['floors']
@@ -0,0 +1,103 @@
+import random
+import unittest
+
+from ..direction_utility import DirectionUtility
+from ..editor.floor_data import FloorData
+from ..editor.bitboard_solver import BitboardSolver
+from ..editor.floor_auto_player import FloorAutoPlayer
+from ..editor.solution_cache import SolutionCache
+from ..editor.frontier_counter import FrontierCounter
+from ..editor.floor_pruner import FloorPruner
+from .tcase_floors import random_floor
+
+def _neighbours(width: int, height: int, index: int) -> set[int]:
+    '''Return the indexes of the cells one move away from the cell at the index,
+    worked out directly with DirectionUtility rather than BitboardSolver's masks.'''
+    x, y = index % width, index // width
+    adjacent = set()
+    for direc in (1,-1,2,-2):
+        adj_x, adj_y = DirectionUtility.pos_after_move(x, y, width, height, direc)
+        adjacent.add(adj_y * width + adj_x)
+    adjacent.discard(index)
+    return adjacent
+
+def _count_by_brute_force(width: int, height: int, pos: int, remaining: set[int]) -> int:
+    '''Return the number of ways to paint every remaining cell from the painter's index,
+    by trying every path.'''
+    if not remaining: return 1
+    total = 0
+    for index in _neighbours(width, height, pos) & remaining:
+        total += _count_by_brute_force(width, height, index, remaining - {index})
+    return total
+
+def _cells_in(mask: int) -> set[int]:
+    return {index for index in range(mask.bit_length()) if mask >> index & 1}
+
+class SolverTest(unittest.TestCase):
+    '''Checks the solvers against trying every path, on small random floors.
+    Doesn't need the game window.'''
+    __NUM_FLOORS = 300
+
+    def setUp(self):
+        self.__rng = random.Random(2024)
+
+    def __random_floors(self):
+        for _ in range(self.__NUM_FLOORS):
+            floor = random_floor(self.__rng)
+            width, height, empty, start = BitboardSolver.encode(floor)
+            expected = _count_by_brute_force(width, height, start, _cells_in(empty) - {start})
+            yield floor, expected
+
+    def test_find_solution(self):
+        print ('Testing BitboardSolver against brute force')
+        for floor, expected in self.__random_floors():
+            solution = BitboardSolver.find_solution(floor, node_limit=100000)
+            self.assertEqual(solution is not None, expected > 0)
+            if solution is None: continue
+
+            # Follow the solution, checking it paints every empty cell once.
+            grid = floor.get_cell_grid()
+            width, height = grid.get_size()
+            x, y = floor.get_initial_painter_position()
+            unpainted = {pos for pos in ((x, y) for y in range(height) for x in range(width))
+                         if not grid[pos].get_full()} - {(x, y)}
+            for direc in solution:
+                x, y = DirectionUtility.pos_after_move(x, y, width, height, direc)
+                self.assertIn((x, y), unpainted)
+                unpainted.remove((x, y))
+            self.assertEqual(unpainted, set())
+
+    def test_frontier_counter(self):
+        print ('Testing FrontierCounter against brute force')
+        for floor, expected in self.__random_floors():
+            self.assertEqual(FrontierCounter.num_solutions(floor), expected)
+
+    def test_too_many_to_count(self):
+        '''An open 8x8 floor has too many frontier states for FrontierCounter,
+        so counting gives up, but whether it's possible still comes from BitboardSolver.'''
+        print ('Testing FrontierCounter gives up on an open 8x8 floor')
+        floor = FloorData(8, 8)
+        with self.assertRaises(ValueError): FloorAutoPlayer.num_solutions(floor)
+        self.assertNotIn('solutions', SolutionCache.lookup(floor))
+        self.assertTrue(FloorAutoPlayer.is_possible(floor))
+        self.assertEqual(len(SolutionCache.lookup(floor)['witness']), 63)
+
+    def test_iter_solutions(self):
+        print ('Testing BitboardSolver.iter_solutions() against brute force')
+        for floor, expected in self.__random_floors():
+            self.assertEqual(len(list(BitboardSolver.iter_solutions(floor))), expected)
+
+    def test_pruner(self):
+        '''FloorPruner may only rule out positions that can't be finished.'''
+        print ('Testing FloorPruner against brute force')
+        for _ in range(self.__NUM_FLOORS):
+            floor = random_floor(self.__rng, fill_chance=0.4)
+            width, height, empty, pos = BitboardSolver.encode(floor)
+            remaining = empty & ~(1 << pos)
+            possible = _count_by_brute_force(width, height, pos, _cells_in(remaining)) > 0
+
+            if not FloorPruner.parity_allows(width, height, pos, remaining): self.assertFalse(possible)
+            if not FloorPruner.can_finish(width, height, pos, remaining): self.assertFalse(possible)
+            if FloorPruner.is_connected(width, height, empty):
+                neighbours = BitboardSolver.neighbour_masks(width, height)
+                if FloorPruner.has_splitting_cell(neighbours, empty): self.assertFalse(possible)
@@ -0,0 +1,173 @@
+import os
+import pathlib
+import random
+import tempfile
+import unittest
+
+from ..floorpack_format import FloorpackFormat
+from ..binary_floorpack import BinaryFloorpack
+from ..floorpack_journal import FloorpackJournal
+from .tcase_floors import random_floor, floors_as_data
+
+class FloorpackFormatTest(unittest.TestCase):
+    '''Checks floorpacks come back the same after being saved, in either format.
+    Doesn't need the game window.'''
+
+    def setUp(self):
+        rng = random.Random(2024)
+        self.__floorpack = [random_floor(rng, max_width=8, max_height=8) for _ in range(50)]
+        self.__dir = tempfile.TemporaryDirectory()
+        self.__path = pathlib.Path(self.__dir.name)
+
+    def tearDown(self):
+        self.__dir.cleanup()
+
+    def test_yaml_round_trip(self):
+        print ('Testing YAML floorpacks')
+        loaded = FloorpackFormat.load(FloorpackFormat.dump(self.__floorpack))
+        self.assertEqual(floors_as_data(loaded), floors_as_data(self.__floorpack))
+
+    def test_binary_round_trip(self):
+        print ('Testing YAML floorpacks converted to binary and back')
+        yaml_text = FloorpackFormat.dump(self.__floorpack)
+        pack_path = self.__path / ('test' + BinaryFloorpack.EXTENSION)
+        BinaryFloorpack.save(FloorpackFormat.load(yaml_text), pack_path)
+
+        binary = BinaryFloorpack(pack_path)
+        self.assertEqual(len(binary), len(self.__floorpack))
+        self.assertEqual(floors_as_data(binary), floors_as_data(self.__floorpack))
+        self.assertEqual(FloorpackFormat.dump(binary), yaml_text)
+        binary.close()
+
+    def test_invalid_files(self):
+        print ('Testing invalid floorpack files are rejected')
+        for text in ['', 'floors: []', 'version: 2\nfloors: [{size: [9, 9], start: [0, 0]}]', '[unclosed']:
+            with self.assertRaises(TypeError): FloorpackFormat.load(text)
+
+        pack_path = self.__path / ('test' + BinaryFloorpack.EXTENSION)
+        BinaryFloorpack.save(self.__floorpack, pack_path)
+        with open(pack_path.as_posix(), 'ab') as file: file.write(b'\0')
+        with self.assertRaises(TypeError): BinaryFloorpack(pack_path)
+
+    def test_invalid_binary_floor(self):
+        print ('Testing invalid floors in binary floorpacks are found when they are read')
+        floorpack = self.__floorpack[:3]
+        # Fill cells past the end of the last floor's grid, which needs to be smaller than 8x8.
+        if floorpack[-1].get_cell_grid().get_size() == (8, 8): floorpack[-1].resize(8, 7)
+        pack_path = self.__path / ('test' + BinaryFloorpack.EXTENSION)
+        BinaryFloorpack.save(floorpack, pack_path)
+        with open(pack_path.as_posix(), 'rb+') as file:
+            file.seek(-1, os.SEEK_END)
+            file.write(b'\xff')
+
+        # Only the header is checked when it's opened.
+        binary = BinaryFloorpack(pack_path)
+        self.assertEqual(len(binary), 3)
+        self.assertEqual(floors_as_data(binary[:2]), floors_as_data(floorpack[:2]))
+        with self.assertRaises(TypeError): binary[2]
+        binary.close()
+
+class FloorpackJournalTest(unittest.TestCase):
+    '''Checks changes saved to a floorpack's journal are applied when it's loaded again,
+    and aren't applied to a different version of the file.
+    Doesn't need the game window.'''
+
+    def setUp(self):
+        self.__rng = random.Random(2024)
+        self.__floorpack = [random_floor(self.__rng) for _ in range(5)]
+        self.__dir = tempfile.TemporaryDirectory()
+        self.__pack_path = pathlib.Path(self.__dir.name) / 'test.yaml'
+        self.__write(self.__floorpack, self.__pack_path)
+
+    def tearDown(self):
+        self.__dir.cleanup()
+
+    @staticmethod
+    def __write(floorpack, path):
+        with open(path.as_posix(), 'w') as file:
+            FloorpackFormat.dump(floorpack, file)
+
+    def __load(self):
+        with open(self.__pack_path.as_posix()) as file:
+            floorpack = FloorpackFormat.load(file)
+        return FloorpackJournal.replay(self.__pack_path, floorpack)
+
+    def __make_changes(self) -> list:
+        '''Add one of each record to the journal, and return the floors it should give.'''
+        new_floor, edited_floor = random_floor(self.__rng), random_floor(self.__rng)
+        records = [
+            {'op' : 'insert', 'index' : 1, 'floor' : FloorpackFormat.floor_to_data(new_floor)},
+            {'op' : 'set', 'index' : 3, 'floor' : FloorpackFormat.floor_to_data(edited_floor)},
+            {'op' : 'move', 'from' : 0, 'to' : 4},
+            {'op' : 'delete', 'index' : 2},
+        ]
+        self.assertTrue(FloorpackJournal.append(self.__pack_path, records[:2]))
+        self.assertTrue(FloorpackJournal.append(self.__pack_path, records[2:]))
+
+        expected = list(self.__floorpack)
+        expected.insert(1, new_floor)
+        expected[3] = edited_floor
+        expected.insert(4, expected.pop(0))
+        del expected[2]
+        return expected
+
+    def test_replay(self):
+        print ('Testing floorpack journals')
+        self.assertFalse(FloorpackJournal.has_changes(self.__pack_path))
+        expected = self.__make_changes()
+        self.assertTrue(FloorpackJournal.has_changes(self.__pack_path))
+        self.assertEqual(floors_as_data(self.__load()), floors_as_data(expected))
+
+    def test_compact(self):
+        print ('Testing compacting floorpack journals')
+        expected = self.__make_changes()
+        FloorpackJournal.compact(self.__pack_path, lambda temp_path: self.__write(expected, temp_path))
+        self.assertFalse(FloorpackJournal.has_changes(self.__pack_path))
+        self.assertFalse(FloorpackJournal.is_stale(self.__pack_path))
+        self.assertEqual(floors_as_data(self.__load()), floors_as_data(expected))
+
+        # The new journal is for the compacted file.
+        self.assertTrue(FloorpackJournal.append(self.__pack_path, [{'op' : 'delete', 'index' : 0}]))
+        self.assertEqual(floors_as_data(self.__load()), floors_as_data(expected[1:]))
+
+    def test_unreadable_record(self):
+        print ('Testing floorpack journals cut off part way through a record')
+        self.__make_changes()
+        journal_path = next(self.__pack_path.parent.glob('journal/*.journal'))
+        with open(journal_path.as_posix(), 'rb+') as file:
+            file.truncate(journal_path.stat().st_size - 5)
+
+        # Only the first two records are applied, and it needs compacting before adding more.
+        loaded = self.__load()
+        self.assertEqual(len(loaded), len(self.__floorpack) + 1)
+        self.assertFalse(FloorpackJournal.append(self.__pack_path, [{'op' : 'delete', 'index' : 0}]))
+
+    def test_stale_journal(self):
+        print ('Testing floorpack journals for a file that has been replaced')
+        self.__make_changes()
+        # e.g. git checks out a different version of the file.
+        replacement = [random_floor(self.__rng) for _ in range(3)]
+        self.__write(replacement, self.__pack_path)
+
+        self.assertTrue(FloorpackJournal.is_stale(self.__pack_path))
+        self.assertEqual(floors_as_data(self.__load()), floors_as_data(replacement))
+        self.assertFalse(FloorpackJournal.append(self.__pack_path, [{'op' : 'delete', 'index' : 0}]))
+        # Its changes are kept until it's set aside.
+        self.assertTrue(FloorpackJournal.has_changes(self.__pack_path))
+
+        stale_path = FloorpackJournal.set_aside(self.__pack_path)
+        self.assertEqual(stale_path.name, 'test.yaml.journal.1.stale')
+        self.assertTrue(stale_path.exists())
+        self.assertFalse(FloorpackJournal.is_stale(self.__pack_path))
+        self.assertFalse(FloorpackJournal.has_changes(self.__pack_path))
+
+    def test_compact_stale_journal(self):
+        print ('Testing compacting a floorpack whose journal is for a replaced file')
+        self.__make_changes()
+        replacement = [random_floor(self.__rng) for _ in range(3)]
+        self.__write(replacement, self.__pack_path)
+
+        FloorpackJournal.compact(self.__pack_path, lambda temp_path: self.__write(replacement, temp_path))
+        self.assertTrue((self.__pack_path.parent / 'journal' / 'test.yaml.journal.1.stale').exists())
+        self.assertFalse(FloorpackJournal.is_stale(self.__pack_path))
+        self.assertEqual(floors_as_data(self.__load()), floors_as_data(replacement))
@@ -0,0 +1,122 @@
+'''This script checks that floorpacks can be cleared, without opening a window.
+It can be executed with python, e.g. as part of CI:
+
+    python validate_floors.py                    (every floorpack in resources/floors)
+    python validate_floors.py path/to/pack.yaml  (only the given floorpacks)
+
+Each floor is checked in a pool of worker processes, and a line is printed for it
+with whether it's possible to clear, how many solutions it has, and how long that took.
+Exits with code 1 if any floor is impossible or any floorpack fails to load.
+Run with --help for the other options.'''
+import os
+# pygame is imported by the game's modules, but no window or audio is needed.
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from src.file_utility import FileUtility
+from src.floor_manager import FloorManager
+from src.editor.floor_auto_player import FloorAutoPlayer
+
+def check_floor(floor_obj, count: bool) -> tuple:
+    '''Return whether the floor is possible, its number of solutions,
+    and the time taken in seconds. If the solver gave up on either, it is None instead.
+    Run in a worker process.'''
+    start_time = time.perf_counter()
+    try: possible = FloorAutoPlayer.is_possible(floor_obj)
+    except ValueError: possible = None
+
+    solutions = None
+    if count and possible is not False:
+        try: solutions = FloorAutoPlayer.num_solutions(floor_obj)
+        except ValueError: pass
+        # The count settles it if the possibility check gave up.
+        if solutions is not None: possible = solutions > 0
+    elif possible is False: solutions = 0
+    return possible, solutions, time.perf_counter() - start_time
+
+def load_packs(paths: list[Path]) -> tuple[dict, list[str]]:
+    '''Load the floorpacks at the given paths using FloorManager.
+    Return a dictionary of pack IDs to lists of floors,
+    and a list of messages about files that couldn't be loaded.
+    A file with the same ID as one loaded before (e.g. pack.yaml and pack.pack) isn't loaded,
+    as only one of them would be played.
+    Every floor is read now, so a binary floorpack with an invalid floor is found here.'''
+    invalid = []
+    # Pack IDs to the names of the files they were loaded from.
+    loaded_from = {}
+    for path in paths:
+        try: pack_id = FloorManager.get_packname(path.name)
+        except ValueError: pack_id = None
+        if pack_id in loaded_from:
+            invalid.append(f'{path.name}: has the same floorpack name as {loaded_from[pack_id]}')
+            continue
+        try:
+            FloorManager._load_floorpack(path, path.name)
+            FloorManager._floor_packs[pack_id] = list(FloorManager._floor_packs[pack_id])
+        except TypeError:
+            FloorManager._floor_packs.pop(pack_id, None)
+            invalid.append(f'{path.name}: not a valid floorpack')
+            continue
+        loaded_from[pack_id] = path.name
+    return dict(FloorManager._floor_packs), invalid
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that floorpacks can be cleared.')
+    parser.add_argument('packs', nargs='*', type=Path,
+                        help='floorpack files to check (default: every file in resources/floors)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes (default: one per CPU)')
+    parser.add_argument('--no-count', action='store_true',
+                        help="only check whether floors are possible, don't count solutions")
+    parser.add_argument('--strict', action='store_true',
+                        help='also fail if the solver gives up on a floor')
+    args = parser.parse_args()
+
+    paths = args.packs
+    if not paths:
+        floorpack_dir = FileUtility.path_to_resource_directory('floors')
+        paths = sorted(path for path in floorpack_dir.iterdir() if path.is_file())
+
+    start_time = time.perf_counter()
+    packs, invalid = load_packs(paths)
+    for message in invalid:
+        print (message)
+
+    failures = len(invalid)
+    unknown = 0
+    num_floors = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        # Submit every floor first, so they're all being worked on at once.
+        futures = {
+            pack_id : [pool.submit(check_floor, floor, not args.no_count) for floor in pack]
+            for pack_id, pack in packs.items()
+        }
+        for pack_id, pack in packs.items():
+            for index, (floor, future) in enumerate(zip(pack, futures[pack_id])):
+                possible, solutions, seconds = future.result()
+                num_floors += 1
+                width, height = floor.get_cell_grid().get_size()
+                if possible is None:
+                    status = 'unknown'
+                    unknown += 1
+                else:
+                    status = possible and 'possible' or 'IMPOSSIBLE'
+                    if not possible: failures += 1
+                if args.no_count: count_text = ''
+                elif solutions is None: count_text = ', solutions: ?'
+                else: count_text = f', solutions: {solutions}'
+                print (f'{pack_id} floor {index + 1} ({width}x{height}): {status}{count_text} [{seconds:.3f}s]')
+
+    if args.strict: failures += unknown
+    total_time = time.perf_counter() - start_time
+    print (f'Checked {num_floors} floors in {len(packs)} floorpacks in {total_time:.2f}s: '
+           f'{failures} failed, {unknown} unknown.')
+    return failures == 0
+
+if __name__ == '__main__':
+    sys.exit(0 if main() else 1)